@@ -3,6 +3,33 @@ from functools import wraps
 from sage_imap.exceptions import IMAPMailboxSelectionError
 
 
+class cached_property:
+    """
+    A lock-free replacement for functools.cached_property.
+
+    The first access computes the value and stores it in the instance
+    ``__dict__`` under the attribute name. As a non-data descriptor it is then
+    shadowed by that entry, so later reads are plain attribute lookups; deleting
+    the entry makes the next access compute the value again.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        # Let help() and autodoc see the wrapped method, not this class.
+        self.__doc__ = func.__doc__
+        self.__module__ = func.__module__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = instance.__dict__[self.name] = self.func(instance)
+        return value
+
+
 def mailbox_selection_required(func):
     @wraps(func)
     def wrapper(self, *args, **kwargs):
@@ -2,7 +2,7 @@ from typing import Dict, List, NewType, Union
 
 MessageId = Union[str, int]
 MessageIDList = List[MessageId]
-MessageSetType = Union[str, MessageIDList]
+MessageSetType = Union[str, bytes, MessageIDList]
 
 EmailDate = NewType("EmailDate", str)
 EmailHeaders = Dict[str, str]
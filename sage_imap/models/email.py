@@ -1,20 +1,230 @@
 import email
+import hashlib
+import html
+import itertools
 import logging
+import math
+import mimetypes
+import mmap
 import os
 import re
+import sys
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from difflib import get_close_matches
+from datetime import datetime
 from email import policy
+from email.header import decode_header, make_header
+from email.parser import BytesParser
 from email.utils import parsedate_to_datetime
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from functools import lru_cache
+from operator import attrgetter, ge, le, not_
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    overload,
+)
 
+from sage_imap.decorators import cached_property
 from sage_imap.helpers.enums import Flag
 from sage_imap.helpers.typings import EmailAddress, EmailDate
 
 logger = logging.getLogger(__name__)
 
+_COMMON_EXTENSIONS = {
+    "text/plain": ".txt",
+    "text/html": ".html",
+    "text/csv": ".csv",
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "application/pdf": ".pdf",
+    "application/zip": ".zip",
+    "application/json": ".json",
+    "application/octet-stream": ".bin",
+}
 
-@dataclass
+# Named groups of attachment content types accepted by filter_by_content_type.
+# Bare major types such as "image" are not listed: they match every subtype.
+_MIME_FAMILIES: Dict[str, frozenset] = {
+    "pdf": frozenset(["application/pdf"]),
+    "document": frozenset(
+        [
+            "application/pdf",
+            "application/msword",
+            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            "application/vnd.oasis.opendocument.text",
+            "application/rtf",
+            "text/plain",
+        ]
+    ),
+    "spreadsheet": frozenset(
+        [
+            "application/vnd.ms-excel",
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            "application/vnd.oasis.opendocument.spreadsheet",
+            "text/csv",
+        ]
+    ),
+    "presentation": frozenset(
+        [
+            "application/vnd.ms-powerpoint",
+            "application/vnd.openxmlformats-officedocument.presentationml"
+            ".presentation",
+            "application/vnd.oasis.opendocument.presentation",
+        ]
+    ),
+}
+
+# Bits of EmailMessage.body_flags.
+_HAS_PLAIN = 1
+_HAS_HTML = 2
+_HAS_ATTACHMENTS = 4
+_BOTH_BODIES = _HAS_PLAIN | _HAS_HTML
+
+# One bit per IANA top-level media type, used for "type/" content type filters.
+_MAJOR_TYPE_BITS = {
+    f"{major}/": 1 << position
+    for position, major in enumerate(
+        [
+            "application",
+            "audio",
+            "font",
+            "image",
+            "message",
+            "model",
+            "multipart",
+            "text",
+            "video",
+        ]
+    )
+}
+
+_FLAG_BYTES_TO_ENUM = {flag.value.encode("ascii"): flag for flag in Flag}
+_FLAG_BITS = {flag: 1 << position for position, flag in enumerate(Flag)}
+
+# Columns usable with find_all_by_column: name -> (attribute, array typecode).
+_QUERY_COLUMNS = {"size": ("size", "q"), "date": ("date_timestamp", "d")}
+
+# Fields of the summary dicts produced by EmailIterator.to_dict_list.
+_SUMMARY_FIELDS = ("message_id", "subject", "from_address", "size", "date", "uid")
+_summary_values = attrgetter(*_SUMMARY_FIELDS)
+
+_message_id_key = attrgetter("message_id")
+_from_address_key = attrgetter("from_address")
+_recipients_key = attrgetter("to_address", "cc_address", "bcc_address")
+_subject_key = attrgetter("subject_lower")
+_sender_key = attrgetter("sender_key")
+
+# Cached properties of EmailMessage that must be dropped when the field they are
+# derived from is reassigned.
+_DERIVED_ATTRIBUTES: Dict[str, Tuple[str, ...]] = {
+    "subject": ("subject_lower",),
+    "attachments": (
+        "total_attachment_size",
+        "_mime_index",
+        "body_flags",
+        "content_type_bits",
+    ),
+    "flags": ("flag_mask",),
+    "from_address": ("sender_key",),
+    "to_address": ("recipient_keys",),
+    "cc_address": ("recipient_keys",),
+    "date": ("date_timestamp",),
+    "raw": ("content_hash",),
+    "plain_body": ("plain_body_lower", "body_flags"),
+    "html_body": ("html_text", "html_body_lower", "body_flags"),
+}
+
+_MESSAGE_ID_RE = re.compile(r"<([^>]*)>")
+_REPLY_RE = re.compile(r"^\s*(?:re|aw|sv)\s*:", re.IGNORECASE)
+_FORWARD_RE = re.compile(r"^\s*(?:fwd?|wg)\s*:", re.IGNORECASE)
+_UNSAFE_FILENAME_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+_HTML_TAG_RE = re.compile(r"<[^>]*>")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=128)
+def _compile_pattern(pattern: str, flags: int) -> "re.Pattern[str]":
+    return re.compile(pattern, flags)
+
+
+def _header_body_split(raw: bytes) -> Tuple[bytes, bytes]:
+    # Find the blank line that ends the header block without splitting the
+    # whole message into lines.
+    crlf = raw.find(b"\r\n\r\n")
+    lf = raw.find(b"\n\n")
+    if crlf != -1 and (lf == -1 or crlf < lf):
+        return raw[: crlf + 2], raw[crlf + 4 :]
+    if lf != -1:
+        return raw[: lf + 1], raw[lf + 2 :]
+    return raw, b""
+
+
+@lru_cache(maxsize=4096)
+def _cached_parsedate(date_str: str) -> Optional[str]:
+    # Dates in a mailbox repeat often, so parse each distinct string only once.
+    try:
+        parsed_date = parsedate_to_datetime(date_str)
+    except (TypeError, ValueError) as e:
+        logger.warning("Failed to parse date %r: %s", date_str, e)
+        return None
+    return parsed_date.replace(microsecond=0).isoformat()
+
+
+def _sanitize_filename(filename: str) -> str:
+    # Drop any directory part so the name cannot escape the target directory,
+    # then replace characters that are invalid in file names.
+    name = _UNSAFE_FILENAME_RE.sub("_", os.path.basename(filename or ""))
+    return "attachment" if name in ("", ".", "..") else name
+
+
+def _create_unique_file(directory: str, filename: str) -> Tuple[str, BinaryIO]:
+    # Exclusive creation lets the filesystem decide what clashes, so names that
+    # differ only in case on case-insensitive filesystems, and files created by
+    # concurrent writers, are never overwritten; the next "_N" suffix is tried.
+    base, ext = os.path.splitext(filename)
+    candidate = filename
+    counter = 1
+    while True:
+        file_path = os.path.join(directory, candidate)
+        try:
+            return file_path, open(file_path, "xb")
+        except FileExistsError:
+            candidate = f"{base}_{counter}{ext}"
+            counter += 1
+
+
+@lru_cache(maxsize=65536)
+def _cached_header_decode(header: str) -> str:
+    # Mailing-list and mailer headers repeat across a mailbox.
+    try:
+        return str(make_header(decode_header(header)))
+    except Exception as e:
+        logger.warning("Failed to decode header %r: %s", header, e)
+        return header
+
+
+@lru_cache(maxsize=65536)
+def _cached_sanitize_message_id(message_id: str) -> Optional[str]:
+    # Keep the first bracketed token, dropping comments and folding around it.
+    match = _MESSAGE_ID_RE.search(message_id)
+    if not match:
+        return None
+    return f"<{match.group(1)}>"
+
+
+@dataclass(slots=True)
 class Attachment:
     filename: str
     content_type: str
@@ -22,6 +232,21 @@ class Attachment:
     id: Optional[str] = field(default=None)
     content_id: Optional[str] = field(default=None)
     content_transfer_encoding: Optional[str] = field(default=None)
+    size: Optional[int] = field(default=None)
+
+    def __post_init__(self) -> None:
+        self.filename = _sanitize_filename(self.filename)
+        # Recorded once so totals never have to touch the payload itself.
+        if self.size is None:
+            self.size = len(self.payload or b"")
+
+    def save_to_file(self, directory: str) -> str:
+        os.makedirs(directory, exist_ok=True)
+        file_path, f = _create_unique_file(directory, self.filename)
+        with f:
+            f.write(self.payload)
+        logger.info("Attachment saved to: %s", file_path)
+        return file_path
 
 
 @dataclass
@@ -47,75 +272,94 @@ class EmailMessage:
         if self.raw:
             self.parse_eml_content()
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        for derived in _DERIVED_ATTRIBUTES.get(name, ()):
+            self.__dict__.pop(derived, None)
+
     @classmethod
-    def read_from_eml_file(cls, file_path: str) -> "EmailMessage":
+    def read_from_eml_file(
+        cls, file_path: str, headers_only: bool = False
+    ) -> "EmailMessage":
         with open(file_path, "rb") as f:
             raw_content = f.read()
         instance = cls(message_id="")
         instance.raw = raw_content
-        instance.parse_eml_content()
+        instance.parse_eml_content(headers_only=headers_only)
         return instance
 
     @classmethod
-    def read_from_eml_bytes(cls, eml_bytes: bytes) -> "EmailMessage":
+    def read_from_eml_bytes(
+        cls, eml_bytes: bytes, headers_only: bool = False
+    ) -> "EmailMessage":
         instance = cls(message_id="")
         instance.raw = eml_bytes
-        instance.parse_eml_content()
+        instance.parse_eml_content(headers_only=headers_only)
         return instance
 
-    def parse_eml_content(self) -> None:
-        email_message = email.message_from_bytes(self.raw, policy=policy.default)
+    def parse_eml_content(self, headers_only: bool = False) -> None:
+        # With headers_only only the header block is handed to the parser, so
+        # bodies and attachments are never decoded.
+        raw = _header_body_split(self.raw)[0] if headers_only else self.raw
+        email_message = BytesParser(policy=policy.default).parsebytes(
+            raw, headersonly=headers_only
+        )
         self.message_id = self.sanitize_message_id(email_message.get("Message-ID", ""))
-        self.subject = email_message.get("subject", "")
-        self.from_address = EmailAddress(email_message.get("from", ""))
-        self.to_address = [
-            EmailAddress(addr) for addr in email_message.get_all("to", [])
-        ]
-        self.cc_address = [
-            EmailAddress(addr) for addr in email_message.get_all("cc", [])
-        ]
-        self.bcc_address = [
-            EmailAddress(addr) for addr in email_message.get_all("bcc", [])
-        ]
+        self.subject = self._safe_header_decode(email_message.get("subject", ""))
+        self.from_address = self._parse_email_address(email_message.get("from", ""))
+        self.to_address = self._parse_email_addresses(email_message.get_all("to", []))
+        self.cc_address = self._parse_email_addresses(email_message.get_all("cc", []))
+        self.bcc_address = self._parse_email_addresses(
+            email_message.get_all("bcc", [])
+        )
         self.date = self.parse_date(email_message.get("date"))
+        self.headers = {k: v for k, v in email_message.items()}
+        if headers_only:
+            return
         self.plain_body, self.html_body = self.extract_body(email_message)
         self.attachments = self.extract_attachments(email_message)
-        self.headers = {k: v for k, v in email_message.items()}
 
-    def sanitize_message_id(self, message_id: str) -> Optional[str]:
-        pattern = r"<([^>]*)>"
-        match = re.search(pattern, message_id)
+    @staticmethod
+    def _parse_email_address(address: Any) -> Optional[EmailAddress]:
+        try:
+            # Interned so repeated senders and recipients share one string.
+            return EmailAddress(sys.intern(str(address))) if address else None
+        except Exception as e:
+            logger.warning("Failed to parse email address %r: %s", address, e)
+            return None
 
-        if match:
-            sanitized_message_id = "<" + match.group(1) + ">"
-        else:
-            sanitized_message_id = None
+    def _parse_email_addresses(self, addresses: List[Any]) -> List[EmailAddress]:
+        parsed = [self._parse_email_address(a) for a in addresses if a]
+        return [p for p in parsed if p is not None]
+
+    def _safe_header_decode(self, header: Optional[str]) -> str:
+        if not header:
+            return ""
+        return _cached_header_decode(str(header))
 
-        return sanitized_message_id
+    def sanitize_message_id(self, message_id: Optional[str]) -> Optional[str]:
+        if not message_id:
+            return None
+        return _cached_sanitize_message_id(str(message_id))
 
     def parse_date(self, date_str: Optional[str]) -> Optional[EmailDate]:
-        if date_str:
-            parsed_date = parsedate_to_datetime(date_str)
-            if parsed_date:
-                return EmailDate(parsed_date.replace(microsecond=0).isoformat())
-        return None
+        if not date_str:
+            return None
+        parsed_date = _cached_parsedate(str(date_str))
+        return EmailDate(parsed_date) if parsed_date else None
 
     def extract_body(self, message: email.message.EmailMessage) -> Tuple[str, str]:
         plain_body = ""
         html_body = ""
         if message.is_multipart():
             for part in message.walk():
+                # Parts extract_attachments() picks up are never body text.
+                if self._is_attachment_part(part):
+                    continue
                 content_type = part.get_content_type()
-                content_disposition = str(part.get("Content-Disposition"))
-                if (
-                    content_type == "text/plain"
-                    and "attachment" not in content_disposition
-                ):
+                if content_type == "text/plain":
                     plain_body += self.decode_payload(part)
-                elif (
-                    content_type == "text/html"
-                    and "attachment" not in content_disposition
-                ):
+                elif content_type == "text/html":
                     html_body += self.decode_payload(part)
         else:
             content_type = message.get_content_type()
@@ -128,87 +372,420 @@ class EmailMessage:
     def extract_attachments(
         self, message: email.message.EmailMessage
     ) -> List[Attachment]:
-        attachments = []
-        for part in message.walk():
-            content_disposition = str(part.get("Content-Disposition"))
-            if "attachment" in content_disposition:
-                attachments.append(
-                    Attachment(
-                        id=part.get("X-Attachment-Id"),
-                        filename=part.get_filename(),
-                        content_type=part.get_content_type(),
-                        payload=part.get_payload(decode=True),
-                        content_id=part.get("Content-ID"),
-                        content_transfer_encoding=part.get("Content-Transfer-Encoding"),
-                    )
-                )
-        return attachments
+        return [
+            self._make_attachment(part)
+            for part in message.walk()
+            if self._is_attachment_part(part)
+        ]
+
+    @staticmethod
+    def _is_attachment_part(part: email.message.EmailMessage) -> bool:
+        # Containers never carry an attachment payload of their own.
+        if part.get_content_maintype() == "multipart":
+            return False
+        return part.get_content_disposition() == "attachment"
+
+    def _make_attachment(self, part: email.message.EmailMessage) -> Attachment:
+        content_type = part.get_content_type()
+        filename = part.get_filename()
+        if not filename:
+            extension = self._get_extension_from_content_type(content_type)
+            filename = f"attachment{extension}"
+        return Attachment(
+            id=part.get("X-Attachment-Id"),
+            filename=filename,
+            content_type=content_type,
+            payload=part.get_payload(decode=True),
+            content_id=part.get("Content-ID"),
+            content_transfer_encoding=part.get("Content-Transfer-Encoding"),
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _get_extension_from_content_type(content_type: str) -> str:
+        extension = _COMMON_EXTENSIONS.get(content_type.lower())
+        if extension is None:
+            extension = mimetypes.guess_extension(content_type) or ".bin"
+        return extension
 
     @staticmethod
     def extract_flags(flag_data: bytes) -> List[Flag]:
-        flags = []
-        flag_mapping = {
-            "\\Seen": Flag.SEEN,
-            "\\Answered": Flag.ANSWERED,
-            "\\Flagged": Flag.FLAGGED,
-            "\\Deleted": Flag.DELETED,
-            "\\Draft": Flag.DRAFT,
-            "\\Recent": Flag.RECENT,
-        }
+        if not flag_data:
+            return []
 
-        # Extract flags from the flag_data
-        match = re.search(rb"FLAGS \(([^)]*)\)", flag_data)
-        if match:
-            flag_str = match.group(1).decode("utf-8")
-            for flag in flag_str.split():
-                if flag in flag_mapping:
-                    flags.append(flag_mapping[flag])
+        # Locate the FLAGS list and split it in place instead of running a regex
+        start = flag_data.find(b"FLAGS (")
+        if start == -1:
+            return []
+        start += len(b"FLAGS (")
+        end = flag_data.find(b")", start)
+        if end == -1:
+            return []
 
-        return flags
+        return [
+            _FLAG_BYTES_TO_ENUM[token]
+            for token in flag_data[start:end].split()
+            if token in _FLAG_BYTES_TO_ENUM
+        ]
 
     def decode_payload(self, part: email.message.EmailMessage) -> str:
-        payload = part.get_payload(decode=True)
-        if isinstance(payload, bytes):
-            charset = part.get_content_charset() or "utf-8"
-            try:
-                return payload.decode(charset, errors="replace")
-            except (LookupError, UnicodeDecodeError):
-                return payload.decode("utf-8", errors="replace")
-        elif isinstance(payload, str):
-            return payload
-        elif isinstance(payload, list):
-            return "".join(self.decode_payload(p) for p in payload)
-        return str(payload)
+        if part.is_multipart():
+            # Join the raw bytes of every sub-part and decode them in one pass.
+            payload = b"".join(
+                sub_part.get_payload(decode=True) or b""
+                for sub_part in part.get_payload()
+            )
+        else:
+            payload = part.get_payload(decode=True)
+        if payload is None:
+            return ""
+        charset = part.get_content_charset() or "utf-8"
+        try:
+            return payload.decode(charset, errors="replace")
+        except LookupError:
+            return payload.decode("utf-8", errors="replace")
+
+    @property
+    def all_recipients(self) -> Tuple[EmailAddress, ...]:
+        return tuple(
+            itertools.chain(self.to_address, self.cc_address, self.bcc_address)
+        )
+
+    @cached_property
+    def total_attachment_size(self) -> int:
+        # Cached until ``attachments`` is reassigned; in-place edits of the list
+        # are not tracked.
+        return sum(attachment.size for attachment in self.attachments)
+
+    @cached_property
+    def _mime_index(self) -> Dict[str, List[int]]:
+        # Positions of the attachments grouped by their exact content type.
+        index: Dict[str, List[int]] = {}
+        for position, attachment in enumerate(self.attachments):
+            index.setdefault(attachment.content_type.lower(), []).append(position)
+        return index
+
+    @cached_property
+    def content_type_bits(self) -> int:
+        # Top-level media types of the attachments as a bit set.
+        bits = 0
+        for content_type in self._mime_index:
+            major = content_type.split("/", 1)[0] + "/"
+            bits |= _MAJOR_TYPE_BITS.get(major, 0)
+        return bits
+
+    def get_attachments_by_type(self, content_type: str) -> List[Attachment]:
+        content_type = content_type.lower()
+        positions = sorted(
+            position
+            for key, bucket in self._mime_index.items()
+            if key.startswith(content_type)
+            for position in bucket
+        )
+        return [self.attachments[position] for position in positions]
+
+    @cached_property
+    def date_timestamp(self) -> float:
+        # POSIX timestamp of ``date``, NaN when the message has no usable date.
+        if not self.date:
+            return math.nan
+        try:
+            return datetime.fromisoformat(self.date).timestamp()
+        except ValueError:
+            return math.nan
+
+    @cached_property
+    def content_hash(self) -> str:
+        return hashlib.blake2b(self.raw or b"").hexdigest()
+
+    @cached_property
+    def flag_mask(self) -> int:
+        mask = 0
+        for flag in self.flags:
+            mask |= _FLAG_BITS.get(flag, 0)
+        return mask
+
+    @cached_property
+    def subject_lower(self) -> str:
+        return (self.subject or "").lower()
+
+    @cached_property
+    def html_text(self) -> str:
+        # Plain-text rendering of ``html_body``, computed once per body.
+        if not self.html_body:
+            return ""
+        text = html.unescape(_HTML_TAG_RE.sub(" ", self.html_body))
+        return _WHITESPACE_RE.sub(" ", text).strip()
+
+    def get_body_preview(self, max_length: int = 100) -> str:
+        body = self.plain_body or self.html_text
+        if len(body) <= max_length:
+            return body
+        return body[:max_length] + "..."
+
+    @cached_property
+    def sender_key(self) -> str:
+        return str(self.from_address).lower() if self.from_address else ""
+
+    @cached_property
+    def recipient_keys(self) -> frozenset:
+        return frozenset(
+            str(address).lower()
+            for address in itertools.chain(self.to_address, self.cc_address)
+        )
+
+    @cached_property
+    def plain_body_lower(self) -> str:
+        return (self.plain_body or "").lower()
+
+    @cached_property
+    def html_body_lower(self) -> str:
+        return (self.html_body or "").lower()
+
+    def is_reply(self) -> bool:
+        return bool(_REPLY_RE.match(self.subject or ""))
+
+    def is_forward(self) -> bool:
+        return bool(_FORWARD_RE.match(self.subject or ""))
+
+    @cached_property
+    def body_flags(self) -> int:
+        return (
+            (_HAS_PLAIN if self.plain_body else 0)
+            | (_HAS_HTML if self.html_body else 0)
+            | (_HAS_ATTACHMENTS if self.attachments else 0)
+        )
+
+    @property
+    def is_multipart(self) -> bool:
+        flags = self.body_flags
+        return bool(flags & _HAS_ATTACHMENTS) or flags & _BOTH_BODIES == _BOTH_BODIES
 
     def has_attachments(self) -> bool:
-        return bool(self.attachments)
+        return bool(self.body_flags & _HAS_ATTACHMENTS)
+
+    def has_plain_body(self) -> bool:
+        return bool(self.body_flags & _HAS_PLAIN)
+
+    def has_html_body(self) -> bool:
+        return bool(self.body_flags & _HAS_HTML)
+
+    @property
+    def attachment_count(self) -> int:
+        return len(self.attachments)
 
     def get_attachment_filenames(self) -> List[str]:
         return [attachment.filename for attachment in self.attachments]
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "message_id": self.message_id,
+            "subject": self.subject,
+            "from_address": self.from_address,
+            "to_address": list(self.to_address),
+            "cc_address": list(self.cc_address),
+            "bcc_address": list(self.bcc_address),
+            "date": self.date,
+            "plain_body": self.plain_body,
+            "html_body": self.html_body,
+            "attachments": [
+                {
+                    "filename": attachment.filename,
+                    "content_type": attachment.content_type,
+                    "size": attachment.size,
+                }
+                for attachment in self.attachments
+            ],
+            "flags": [str(flag) for flag in self.flags],
+            "headers": {key: str(value) for key, value in self.headers.items()},
+            "size": self.size,
+            "sequence_number": self.sequence_number,
+            "uid": self.uid,
+        }
+
     def write_to_eml_file(self, file_path: str) -> None:
         if not file_path.endswith(".eml"):
             file_path += ".eml"
 
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._write_eml(file_path)
 
-        with open(file_path, "wb") as f:
+    def _write_eml(self, file_path: str, exclusive: bool = False) -> str:
+        # With ``exclusive`` an existing file is never replaced; the name gets
+        # the next free "_N" suffix instead. Returns the path written.
+        if self.raw is None:
+            raise ValueError(f"Email {self.message_id!r} has no raw content to write")
+        if exclusive:
+            file_path, f = _create_unique_file(*os.path.split(file_path))
+        else:
+            f = open(file_path, "wb")
+        # A buffered writer keeps writing until every byte is out, unlike a raw
+        # FileIO.write(), which may stop short.
+        with f:
             f.write(self.raw)
+        return file_path
+
+
+class _MboxEmailList(Sequence[EmailMessage]):
+    """Read-only sequence of messages parsed on demand from a memory-mapped mbox."""
+
+    def __init__(self, buffer: mmap.mmap, offsets: List[Tuple[int, int]]):
+        self._buffer = buffer
+        self._offsets = offsets
+
+    @classmethod
+    def from_file(cls, file_path: str) -> Union["_MboxEmailList", List[EmailMessage]]:
+        if os.path.getsize(file_path) == 0:
+            return []
+        with open(file_path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Index message boundaries up front; bodies are only read when accessed.
+        starts = []
+        position = 0 if buffer[:5] == b"From " else buffer.find(b"\nFrom ")
+        while position != -1:
+            if buffer[position : position + 1] == b"\n":
+                position += 1
+            starts.append(position)
+            position = buffer.find(b"\nFrom ", position)
+
+        offsets = []
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else len(buffer)
+            # Skip the "From " separator line, it is not part of the message.
+            body_start = buffer.find(b"\n", start, end)
+            offsets.append((end if body_start == -1 else body_start + 1, end))
+        return cls(buffer, offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    @overload
+    def __getitem__(self, index: int) -> EmailMessage: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "_MboxEmailList": ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[EmailMessage, "_MboxEmailList"]:
+        if isinstance(index, slice):
+            return _MboxEmailList(self._buffer, self._offsets[index])
+        start, end = self._offsets[index]
+        return EmailMessage.read_from_eml_bytes(self._buffer[start:end])
+
+    def close(self) -> None:
+        # Slices share the mapping, so this closes them as well.
+        self._buffer.close()
+
+
+class _ChainedEmailList(Sequence[EmailMessage]):
+    """Read-only concatenation of several iterators that copies none of them."""
+
+    def __init__(self, parts: List[Tuple[Sequence[EmailMessage], Sequence[int]]]):
+        # Each part is a backing list with the positions visible from it.
+        self._parts = parts
+        self._starts = list(itertools.accumulate((len(p[1]) for p in parts), initial=0))
+
+    def __len__(self) -> int:
+        return self._starts[-1]
+
+    @overload
+    def __getitem__(self, index: int) -> EmailMessage: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[EmailMessage]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[EmailMessage, List[EmailMessage]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Index out of range")
+        part = bisect_right(self._starts, index) - 1
+        email_list, positions = self._parts[part]
+        return email_list[positions[index - self._starts[part]]]
 
 
 class EmailIterator:
-    def __init__(self, email_list: List[EmailMessage]):
+    def __init__(
+        self,
+        email_list: Sequence[EmailMessage],
+        filtered_indices: Optional[Sequence[int]] = None,
+    ):
         self._email_list = email_list
+        # Positions into ``_email_list`` visible through this iterator; filters
+        # and slices share the backing list and only narrow these positions.
+        self._filtered_indices = filtered_indices
+        # Per-field value columns of ``_email_list``, built on first use and
+        # shared with every view. They are snapshots used for sorting, ranges
+        # and lookups: changing an email's fields in place is not seen until
+        # refresh() is called.
+        self._columns: Dict[str, array] = {}
+        # Field value -> positions lookups over ``_email_list``, shared the same
+        # way as the columns.
+        self._lookups: Dict[str, Dict[Any, List[int]]] = {}
+        # Length of ``_email_list`` the shared caches were built at; appending
+        # to or removing from the backing list drops them on their next use.
+        self._cache_length: List[int] = [len(email_list)]
+        # Backing position -> offset within this view, built on first use.
+        self._view_offsets: Optional[Dict[int, int]] = None
         self._index = 0
 
+    @classmethod
+    def from_mbox(cls, file_path: str) -> "EmailIterator":
+        """
+        Creates an EmailIterator over the messages of an mbox file.
+
+        The file is memory-mapped and only the message boundaries are indexed
+        up front; each message is parsed when it is accessed, so memory use
+        does not grow with the size of the mailbox.
+
+        Nothing parsed is kept: every access parses the message again, and
+        the first use of each column or lookup (sizes, flags, dates,
+        Message-IDs, ...) parses the whole mailbox once. For many queries over
+        a mailbox that fits in memory, materialise it with
+        ``EmailIterator(list(iterator))``.
+
+        The mapping stays open until close() is called or the iterator is
+        used as a context manager; views of the iterator share it.
+        """
+        return cls(_MboxEmailList.from_file(file_path))
+
+    def close(self) -> None:
+        """
+        Releases the memory-mapped file behind an iterator from from_mbox.
+
+        Views and slices of that iterator become unusable as well. Iterators
+        over in-memory lists hold no resources and are left untouched.
+        """
+        if isinstance(self._email_list, _MboxEmailList):
+            self._email_list.close()
+
+    def __enter__(self) -> "EmailIterator":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type],
+        exc_value: Optional[BaseException],
+        traceback: Optional[object],
+    ) -> None:
+        self.close()
+
     def __iter__(self) -> "EmailIterator":
         self._index = 0
         return self
 
     def __next__(self) -> EmailMessage:
-        if self._index >= len(self._email_list):
+        if self._index >= len(self):
             raise StopIteration
-        email_message = self._email_list[self._index]
+        email_message = self._email_list[self._indices()[self._index]]
         self._index += 1
         return email_message
 
@@ -216,19 +793,225 @@ class EmailIterator:
         self, index: Union[int, slice]
     ) -> Union[EmailMessage, "EmailIterator"]:
         if isinstance(index, int):
-            if index < 0 or index >= len(self._email_list):
+            if index < 0 or index >= len(self):
                 raise IndexError("Index out of range")
-            return self._email_list[index]
+            return self._email_list[self._indices()[index]]
         elif isinstance(index, slice):
-            return EmailIterator(self._email_list[index])
+            return self._view(self._indices()[index])
         else:
             raise TypeError("Invalid argument type")
 
     def __len__(self) -> int:
-        return len(self._email_list)
+        if self._filtered_indices is None:
+            return len(self._email_list)
+        return len(self._filtered_indices)
 
     def __repr__(self) -> str:
-        return f"EmailIterator({len(self._email_list)} emails)"
+        return f"EmailIterator({len(self)} emails)"
+
+    def _indices(self) -> Sequence[int]:
+        if self._filtered_indices is None:
+            return range(len(self._email_list))
+        return self._filtered_indices
+
+    def _iter_emails(self) -> Iterator[EmailMessage]:
+        if self._filtered_indices is None:
+            return iter(self._email_list)
+        return map(self._email_list.__getitem__, self._filtered_indices)
+
+    def _view(self, indices: Sequence[int]) -> "EmailIterator":
+        view = EmailIterator(self._email_list, indices)
+        view._columns = self._columns
+        view._lookups = self._lookups
+        view._cache_length = self._cache_length
+        return view
+
+    def refresh(self) -> None:
+        """
+        Drop the cached field columns and lookups.
+
+        Sorting, range filters and ``find_by_*`` lookups work on snapshots of
+        the email fields. Call this after changing emails in place so that
+        this iterator and every view sharing its emails see the new values.
+        """
+        self._columns.clear()
+        self._lookups.clear()
+        self._cache_length[0] = len(self._email_list)
+
+    def _drop_stale_caches(self) -> None:
+        if self._cache_length[0] != len(self._email_list):
+            self.refresh()
+
+    def _column(self, name: str, typecode: str = "q") -> array:
+        self._drop_stale_caches()
+        column = self._columns.get(name)
+        if column is None:
+            column = array(typecode, map(attrgetter(name), self._email_list))
+            self._columns[name] = column
+        return column
+
+    def _lookup(self, name: str) -> Dict[Any, List[int]]:
+        self._drop_stale_caches()
+        lookup = self._lookups.get(name)
+        if lookup is None:
+            lookup = {}
+            values = map(attrgetter(name), self._email_list)
+            for position, value in enumerate(values):
+                if value:
+                    lookup.setdefault(value, []).append(position)
+            self._lookups[name] = lookup
+        return lookup
+
+    def _offsets(self) -> Dict[int, int]:
+        if self._view_offsets is None:
+            self._view_offsets = {p: i for i, p in enumerate(self._indices())}
+        return self._view_offsets
+
+    def _identity_lookup(self) -> Dict[int, List[int]]:
+        lookup = self._lookups.get("_identity")
+        if lookup is None:
+            lookup = {}
+            for position, email in enumerate(self._email_list):
+                lookup.setdefault(id(email), []).append(position)
+            self._lookups["_identity"] = lookup
+        return lookup
+
+    def _view_order(self) -> Callable[[int], int]:
+        # Sort key putting backing positions in the order this view shows them.
+        if self._filtered_indices is None:
+            return int
+        return self._offsets().__getitem__
+
+    def _visible(self, positions: List[int]) -> List[int]:
+        if self._filtered_indices is None:
+            return positions
+        offsets = self._offsets()
+        return [p for p in positions if p in offsets]
+
+    def _sorted_view(
+        self, keys: Sequence[Any], reverse: bool = False
+    ) -> "EmailIterator":
+        # ``keys`` holds one sort key per visible email, in view order.
+        indices = self._indices()
+        order = sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+        return self._view(array("q", [indices[i] for i in order]))
+
+    def _range_view(
+        self, name: str, low: Any, high: Any, typecode: str = "q"
+    ) -> "EmailIterator":
+        # Each bound is applied as one map()/compress() pass over the column,
+        # keeping the per-message comparisons out of the interpreter loop.
+        column = self._column(name, typecode)
+        positions = self._indices()
+        for bound, op in ((low, le), (high, ge)):
+            if bound is None:
+                continue
+            values = map(column.__getitem__, positions)
+            mask = map(op, itertools.repeat(bound), values)
+            positions = array("q", itertools.compress(positions, mask))
+        if not isinstance(positions, array):
+            positions = array("q", positions)
+        return self._view(positions)
+
+    def _non_nan_positions(self, column: array) -> Tuple[List[int], List[int]]:
+        # Splits the visible positions into those with a value and the NaN ones.
+        indices = self._indices()
+        missing = list(map(math.isnan, map(column.__getitem__, indices)))
+        present = list(itertools.compress(indices, map(not_, missing)))
+        return present, list(itertools.compress(indices, missing))
+
+    def _sorted_by_column(
+        self, name: str, reverse: bool = False, typecode: str = "q"
+    ) -> "EmailIterator":
+        # Positions are sorted with the column's own __getitem__ as the key, so
+        # no Python-level key function runs; NaN values always go last.
+        column = self._column(name, typecode)
+        if typecode == "d":
+            positions, missing = self._non_nan_positions(column)
+        else:
+            positions, missing = list(self._indices()), []
+        positions.sort(key=column.__getitem__, reverse=reverse)
+        return self._view(array("q", positions + missing))
+
+    def _sum_field(self, name: str) -> int:
+        # Totals read the emails themselves rather than the column snapshots so
+        # they always reflect in-place changes.
+        return sum(map(attrgetter(name), self._iter_emails()))
+
+    def take(self, count: int) -> "EmailIterator":
+        return self._view(self._indices()[: max(count, 0)])
+
+    def skip(self, count: int) -> "EmailIterator":
+        return self._view(self._indices()[max(count, 0) :])
+
+    def page(self, page_number: int, page_size: int) -> "EmailIterator":
+        if page_number < 1 or page_size < 1:
+            raise ValueError("Page number and page size must be positive")
+        start = (page_number - 1) * page_size
+        return self._view(self._indices()[start : start + page_size])
+
+    def page_after(
+        self, cursor: Optional[str], page_size: int
+    ) -> Tuple[List[EmailMessage], Optional[str]]:
+        """
+        Returns the page of emails following the email whose Message-ID is
+        ``cursor`` (or the first page when ``cursor`` is None), together with
+        the cursor of the next page, which is None once the end is reached.
+
+        The cursor is resolved through the Message-ID lookup, so the cost
+        does not grow with how far into the iterator the page starts. When a
+        Message-ID occurs more than once in the view, the returned cursor is
+        the Message-ID followed by a space and the 0-based occurrence, which
+        points at that exact copy. Raises ValueError when the last email of a
+        page that is not the final one has no Message-ID to continue from.
+        """
+        if page_size < 1:
+            raise ValueError("Page size must be positive")
+        start = 0
+        if cursor is not None:
+            start = self._cursor_offset(cursor) + 1
+        end = start + page_size
+        positions = self._indices()[start:end]
+        items = [self._email_list[p] for p in positions]
+        if not items or end >= len(self):
+            return items, None
+        message_id = items[-1].message_id
+        if not message_id:
+            raise ValueError(
+                "Cannot continue after an email without a Message-ID; "
+                "use page() instead"
+            )
+        occurrence = self._occurrences(message_id).index(positions[-1])
+        next_cursor = f"{message_id} {occurrence}" if occurrence else message_id
+        return items, next_cursor
+
+    def _occurrences(self, message_id: str) -> List[int]:
+        # Visible positions holding ``message_id``, in the order of this view.
+        positions = self._visible(self._lookup("message_id").get(message_id, []))
+        return sorted(positions, key=self._view_order())
+
+    def _cursor_offset(self, cursor: str) -> int:
+        # Offset within this view of the email a page_after cursor points at.
+        message_id, occurrence = cursor, 0
+        positions = self._occurrences(cursor)
+        if not positions:
+            message_id, _, suffix = cursor.rpartition(" ")
+            if suffix.isdigit() and message_id:
+                occurrence = int(suffix)
+                positions = self._occurrences(message_id)
+        if occurrence >= len(positions):
+            raise ValueError(f"Unknown cursor: {cursor}")
+        position = positions[occurrence]
+        if self._filtered_indices is None:
+            return position
+        return self._offsets()[position]
+
+    def chain(self, *others: "EmailIterator") -> "EmailIterator":
+        parts = [
+            (iterator._email_list, iterator._indices())
+            for iterator in (self, *others)
+        ]
+        return EmailIterator(_ChainedEmailList(parts))
 
     def reset(self) -> None:
         self._index = 0
@@ -237,31 +1020,343 @@ class EmailIterator:
         return self._index
 
     def __reversed__(self) -> "EmailIterator":
-        return EmailIterator(list(reversed(self._email_list)))
+        return self._view(self._indices()[::-1])
 
     def __contains__(self, item: EmailMessage) -> bool:
-        return item in self._email_list
+        # The email objects of an in-memory list are the ones callers hold, so
+        # an identity hit answers without comparing any fields. Lazily parsed
+        # lists hand out fresh objects and go straight to the equality checks.
+        if isinstance(self._email_list, list):
+            positions = self._identity_lookup().get(id(item))
+            if positions and self._visible(positions):
+                return True
+        if not getattr(item, "message_id", None):
+            return item in self._iter_emails()
+        candidates = self._lookup("message_id").get(item.message_id, [])
+        return any(
+            self._email_list[position] == item
+            for position in self._visible(candidates)
+        )
 
     def count(self, condition: Callable[[EmailMessage], bool]) -> int:
-        return sum(1 for email in self._email_list if condition(email))
+        return sum(1 for email in self._iter_emails() if condition(email))
+
+    def find_all(self, condition: Callable[[EmailMessage], bool]) -> List[EmailMessage]:
+        return [email for email in self._iter_emails() if condition(email)]
+
+    def _column_positions(
+        self, column: str, op: Callable[[Any, Any], bool], value: Any
+    ) -> Iterator[int]:
+        if column not in _QUERY_COLUMNS:
+            raise ValueError(f"Unsupported column: {column}")
+        values = self._column(*_QUERY_COLUMNS[column])
+        if isinstance(value, datetime):
+            value = value.timestamp()
+        indices = self._indices()
+        # The comparison runs through map() and compress() so no Python-level
+        # loop is involved; NaN dates compare false.
+        mask = map(op, map(values.__getitem__, indices), itertools.repeat(value))
+        return itertools.compress(indices, mask)
+
+    def find_all_by_column(
+        self, column: str, op: Callable[[Any, Any], bool], value: Any
+    ) -> List[EmailMessage]:
+        positions = self._column_positions(column, op, value)
+        return list(map(self._email_list.__getitem__, positions))
+
+    def count_by_column(
+        self, column: str, op: Callable[[Any, Any], bool], value: Any
+    ) -> int:
+        return sum(1 for _ in self._column_positions(column, op, value))
 
     def filter(self, criteria: Callable[[EmailMessage], bool]) -> "EmailIterator":
-        filtered_emails = [email for email in self._email_list if criteria(email)]
-        return EmailIterator(filtered_emails)
+        positions = array(
+            "q",
+            [
+                position
+                for position, email in zip(self._indices(), self._iter_emails())
+                if criteria(email)
+            ],
+        )
+        return self._view(positions)
+
+    def deduplicate(
+        self, key: Optional[Callable[[EmailMessage], Any]] = None
+    ) -> "EmailIterator":
+        # The set holds references to keys the messages already own, so it
+        # adds no per-key copies; messages without a key are always kept.
+        key = key or _message_id_key
+        seen: Set[Any] = set()
+        positions = array("q")
+        for position, value in zip(self._indices(), map(key, self._iter_emails())):
+            if value is None or value == "":
+                positions.append(position)
+            elif value not in seen:
+                seen.add(value)
+                positions.append(position)
+        return self._view(positions)
 
     def filter_by_header(self, key: str) -> "EmailIterator":
         return self.filter(lambda email: key in email.headers.keys())
 
-    def filter_by_subject_part(self, part: str) -> "EmailIterator":
-        subjects = [email.subject for email in self._email_list]
-        close_matches = get_close_matches(part, subjects)
-        return self.filter(lambda email: email.subject in close_matches)
+    def filter_by_subject_part(
+        self, part: str, case_sensitive: bool = False
+    ) -> "EmailIterator":
+        if case_sensitive:
+            return self.filter(lambda email: part in (email.subject or ""))
+        part = part.lower()
+        return self.filter(lambda email: part in email.subject_lower)
+
+    def filter_by_subject_regex(
+        self, pattern: str, flags: int = re.IGNORECASE
+    ) -> "EmailIterator":
+        compiled = _compile_pattern(pattern, flags)
+        return self.filter(
+            lambda email: compiled.search(email.subject or "") is not None
+        )
+
+    def filter_by_sender(
+        self, sender: str, exact_match: bool = False
+    ) -> "EmailIterator":
+        sender = sender.lower()
+        if exact_match:
+            return self.filter(lambda email: email.sender_key == sender)
+        return self.filter(lambda email: sender in email.sender_key)
+
+    def filter_by_senders(self, senders: Sequence[str]) -> "EmailIterator":
+        if not senders:
+            return self._view(array("q"))
+        # One alternation scans each sender key once for all needles.
+        pattern = "|".join(map(re.escape, sorted({s.lower() for s in senders})))
+        search = _compile_pattern(pattern, 0).search
+        return self.filter(lambda email: search(email.sender_key) is not None)
+
+    def filter_by_recipient(
+        self, recipient: str, exact_match: bool = False
+    ) -> "EmailIterator":
+        recipient = recipient.lower()
+        if exact_match:
+            return self.filter(lambda email: recipient in email.recipient_keys)
+        return self.filter(
+            lambda email: any(recipient in key for key in email.recipient_keys)
+        )
+
+    def filter_by_body_content(
+        self,
+        content: str,
+        html_only: bool = False,
+        plain_only: bool = False,
+        case_sensitive: bool = False,
+    ) -> "EmailIterator":
+        if case_sensitive:
+            plain_of, html_of = attrgetter("plain_body"), attrgetter("html_body")
+        else:
+            content = content.lower()
+            plain_of = attrgetter("plain_body_lower")
+            html_of = attrgetter("html_body_lower")
+        if html_only:
+            return self.filter(lambda email: content in (html_of(email) or ""))
+        if plain_only:
+            return self.filter(lambda email: content in (plain_of(email) or ""))
+        return self.filter(
+            lambda email: content in (plain_of(email) or "")
+            or content in (html_of(email) or "")
+        )
 
     def find_by_message_id(self, message_id: str) -> Optional[EmailMessage]:
-        return self.find(lambda email: email.message_id == message_id)
+        positions = self._visible(self._lookup("message_id").get(message_id, []))
+        return self._email_list[positions[0]] if positions else None
+
+    def filter_by_content_type(self, content_type: str) -> "EmailIterator":
+        content_type = content_type.lower()
+        family = _MIME_FAMILIES.get(content_type)
+        if family is not None:
+            return self.filter(lambda email: not family.isdisjoint(email._mime_index))
+        bit = _MAJOR_TYPE_BITS.get(content_type)
+        if bit is None:
+            bit = _MAJOR_TYPE_BITS.get(f"{content_type}/")
+        if bit is not None:
+            return self._filter_bits("content_type_bits", bit)
+        return self.filter(
+            lambda email: any(key.startswith(content_type) for key in email._mime_index)
+        )
+
+    def filter_by_size_range(
+        self, min_size: int = 0, max_size: Optional[int] = None
+    ) -> "EmailIterator":
+        return self._range_view("size", min_size, max_size)
+
+    def filter_by_attachment_count(
+        self, min_count: int = 0, max_count: Optional[int] = None
+    ) -> "EmailIterator":
+        return self._range_view("attachment_count", min_count, max_count)
+
+    def filter_by_flags(
+        self, flags: List[Flag], match_all: bool = True
+    ) -> "EmailIterator":
+        wanted = 0
+        for flag in flags:
+            wanted |= _FLAG_BITS[Flag(flag)]
+        masks = self._column("flag_mask")
+        if match_all:
+            positions = [p for p in self._indices() if masks[p] & wanted == wanted]
+        else:
+            positions = [p for p in self._indices() if masks[p] & wanted]
+        return self._view(array("q", positions))
+
+    def filter_by_date_range(self, start: datetime, end: datetime) -> "EmailIterator":
+        # Missing dates are NaN and fail both comparisons.
+        return self._range_view(
+            "date_timestamp", start.timestamp(), end.timestamp(), typecode="d"
+        )
+
+    def sort_by_date(self, reverse: bool = False) -> "EmailIterator":
+        return self._sorted_by_column("date_timestamp", reverse, typecode="d")
+
+    def sort_by_size(self, reverse: bool = False) -> "EmailIterator":
+        return self._sorted_by_column("size", reverse)
+
+    def sort_by_attachment_count(self, reverse: bool = False) -> "EmailIterator":
+        return self._sorted_by_column("attachment_count", reverse)
+
+    def sort_by_subject(self, reverse: bool = False) -> "EmailIterator":
+        keys = list(map(_subject_key, self._iter_emails()))
+        return self._sorted_view(keys, reverse)
+
+    def sort_by_sender(self, reverse: bool = False) -> "EmailIterator":
+        keys = list(map(_sender_key, self._iter_emails()))
+        return self._sorted_view(keys, reverse)
+
+    def get_date_range(self) -> Optional[Tuple[EmailDate, EmailDate]]:
+        timestamps = self._column("date_timestamp", "d")
+        dated = self._non_nan_positions(timestamps)[0]
+        if not dated:
+            return None
+        earliest = min(dated, key=timestamps.__getitem__)
+        latest = max(dated, key=timestamps.__getitem__)
+        return self._email_list[earliest].date, self._email_list[latest].date
+
+    def get_unique_senders(self) -> Set[EmailAddress]:
+        senders = set(map(_from_address_key, self._iter_emails()))
+        senders.discard(None)
+        senders.discard("")
+        return senders
+
+    def get_unique_recipients(self) -> Set[EmailAddress]:
+        recipients: Set[EmailAddress] = set()
+        recipients.update(
+            *itertools.chain.from_iterable(map(_recipients_key, self._iter_emails()))
+        )
+        return recipients
+
+    def group_by_sender(self) -> Dict[EmailAddress, "EmailIterator"]:
+        # Groups come from the shared sender lookup, so only the positions are
+        # stored and nothing is re-read from the messages.
+        order = self._view_order()
+        groups = [
+            (sender, sorted(visible, key=order))
+            for sender, positions in self._lookup("from_address").items()
+            if (visible := self._visible(positions))
+        ]
+        groups.sort(key=lambda group: order(group[1][0]))
+        return {sender: self._view(array("q", group)) for sender, group in groups}
+
+    def group_by_date(self) -> Dict[str, "EmailIterator"]:
+        order = self._view_order()
+        groups = {}
+        for day, positions in self._day_lookup().items():
+            visible = self._visible(positions)
+            if visible:
+                groups[day] = self._view(array("q", sorted(visible, key=order)))
+        return groups
+
+    def _day_lookup(self) -> Dict[str, List[int]]:
+        # Day -> positions, in day order, derived once from the date lookup by
+        # bucketing the distinct date strings on their YYYY-MM-DD prefix;
+        # undated messages are left out. Shared with every view.
+        self._drop_stale_caches()
+        days = self._lookups.get("_day")
+        if days is None:
+            buckets: Dict[str, List[int]] = {}
+            for date, positions in self._lookup("date").items():
+                buckets.setdefault(date[:10], []).extend(positions)
+            days = {day: sorted(buckets[day]) for day in sorted(buckets)}
+            self._lookups["_day"] = days
+        return days
+
+    def to_dicts(self) -> Iterator[Dict[str, Any]]:
+        return (email.to_dict() for email in self._iter_emails())
+
+    def to_dict_list(self) -> List[Dict[str, Any]]:
+        # One attrgetter call per email fetches every summary field in C.
+        return [
+            dict(zip(_SUMMARY_FIELDS, values))
+            for values in map(_summary_values, self._iter_emails())
+        ]
+
+    def save_all_to_directory(
+        self, directory: str, max_workers: Optional[int] = None
+    ) -> List[str]:
+        os.makedirs(directory, exist_ok=True)
+        jobs = []
+        names: Set[str] = set()
+        for position, email in zip(self._indices(), self._iter_emails()):
+            # A uid can equal another email's position, and chained or merged
+            # folders can repeat uids, so clashing names get a "_N" suffix.
+            base = str(email.uid if email.uid is not None else position)
+            name, counter = base, 1
+            while name in names:
+                name = f"{base}_{counter}"
+                counter += 1
+            names.add(name)
+            jobs.append((email, os.path.join(directory, f"{name}.eml")))
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+        # File writes release the GIL, so a thread pool overlaps the disk waits.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(lambda job: self._save_one(*job), jobs)
+            saved_paths = [path for path in results if path is not None]
+        logger.info("Saved %d emails to %s", len(saved_paths), directory)
+        return saved_paths
+
+    @staticmethod
+    def _save_one(email: EmailMessage, file_path: str) -> Optional[str]:
+        try:
+            return email._write_eml(file_path, exclusive=True)
+        except (OSError, ValueError) as e:
+            logger.error("Failed to save email to %s: %s", file_path, e)
+            return None
+
+    def _filter_bits(self, name: str, bits: int) -> "EmailIterator":
+        column = self._column(name)
+        positions = [p for p in self._indices() if column[p] & bits]
+        return self._view(array("q", positions))
 
     def filter_by_attachment(self) -> "EmailIterator":
-        return self.filter(lambda email: email.attachments != list())
+        return self._filter_bits("body_flags", _HAS_ATTACHMENTS)
+
+    def filter_by_html_body(self) -> "EmailIterator":
+        return self._filter_bits("body_flags", _HAS_HTML)
+
+    def filter_multipart(self) -> "EmailIterator":
+        return self.filter(attrgetter("is_multipart"))
 
     def get_total_size(self) -> int:
-        return sum(email.size for email in self._email_list)
+        return self._sum_field("size")
+
+    def get_statistics(self) -> Dict[str, Any]:
+        total_emails = len(self)
+        total_size = self._sum_field("size")
+        counts = array("q", map(attrgetter("attachment_count"), self._iter_emails()))
+        return {
+            "total_emails": total_emails,
+            "total_size": total_size,
+            "average_size": total_size / total_emails if total_emails else 0,
+            "total_attachments": sum(counts),
+            "emails_with_attachments": len(counts) - counts.count(0),
+            "unique_senders": len(self.get_unique_senders()),
+            "date_range": self.get_date_range(),
+        }
+
+    def get_total_attachment_size(self) -> int:
+        return self._sum_field("total_attachment_size")
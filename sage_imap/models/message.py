@@ -1,10 +1,35 @@
-from dataclasses import dataclass, field
+import re
+import sys
+from array import array
+from bisect import bisect_right
+from dataclasses import FrozenInstanceError, dataclass, field
 from enum import StrEnum
+from functools import lru_cache
+from typing import Any, Optional, Tuple
 
 from sage_imap.helpers.typings import MessageSetType
 
+_ID_RE = re.compile(r"[0-9]+")
+_RANGE_RE = re.compile(r"([0-9]+):([0-9]+|\*)")
+# Message sequence numbers and UIDs are 32-bit (nz-number in RFC 3501).
+_MAX_ID = 2**32 - 1
+# Any run of this many digits may exceed _MAX_ID and needs a closer look.
+_LONG_ID_RE = re.compile(r"[0-9]{10}")
+# Upper bound used for the open end of a '1:*' range.
+_OPEN_END = sys.maxsize
+_MESSAGE_SET_RE = re.compile(
+    r"[0-9]+(?::(?:[0-9]+|\*))?(?:,[0-9]+(?::(?:[0-9]+|\*))?)*"
+)
 
-@dataclass
+
+def _is_plain_id(msg_id: Any) -> bool:
+    # bool is an int subclass, but True is not message ID 1.
+    if isinstance(msg_id, str):
+        return _ID_RE.fullmatch(msg_id) is not None
+    return isinstance(msg_id, int) and not isinstance(msg_id, bool)
+
+
+@dataclass(slots=True)
 class MessageSet:
     """
     A class to represent a set of email messages by their IDs.
@@ -19,41 +44,213 @@ class MessageSet:
     ----------
     msg_ids : MessageSetType
         A string of message IDs, which can be a single ID, a comma-separated list, a
-        range, or a list of IDs.
+        range, or a list of IDs. Bytes, as found in IMAP responses, are decoded to a
+        string.
 
     Methods
     -------
-    __post_init__():
-        Post-initialization method to convert list of IDs to a string and validate the
-        message set.
-    _convert_list_to_string():
-        Converts a list of message IDs to a comma-separated string.
+    __setattr__():
+        Converts a list of IDs to a string and validates the message set whenever
+        msg_ids is assigned, including during initialization.
+    from_range(start, end):
+        Builds a message set for a contiguous range without parsing it.
+    of(spec):
+        Returns a shared, cached message set for a message set string.
+    get_first_id():
+        Returns the lowest message ID in the set.
+    get_last_id():
+        Returns the highest message ID in the set, or None for an open range.
     _validate_message_set():
         Validates the format of the message IDs.
     """
 
     msg_ids: MessageSetType = field(default_factory=str)
+    _bounds: Optional[Tuple[array, array]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Set on the shared instances handed out by of(); their msg_ids is fixed.
+    _frozen: bool = field(default=False, init=False, repr=False, compare=False)
 
-    def __post_init__(self) -> None:
-        self._convert_list_to_string()
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name != "msg_ids":
+            object.__setattr__(self, name, value)
+            return
+        if getattr(self, "_frozen", False):
+            raise FrozenInstanceError(
+                "cannot assign to field 'msg_ids' of a shared MessageSet"
+            )
+        if isinstance(value, list):
+            value = self._optimize_id_string(value)
+        elif isinstance(value, (bytes, bytearray)):
+            # Message sets are ASCII; latin-1 never fails, so stray bytes are
+            # reported by validation like any other invalid component.
+            value = value.decode("latin-1")
+        object.__setattr__(self, "msg_ids", value)
+        object.__setattr__(self, "_bounds", None)
         self._validate_message_set()
 
-    def _convert_list_to_string(self) -> None:
+    def __contains__(self, msg_id: object) -> bool:
         """
-        Converts a list of message IDs to a comma-separated string.
+        Checks whether a message ID falls inside the message set.
 
-        Purpose
+        Notes
+        -----
+        Membership is answered by a binary search over the sorted, merged
+        intervals of the set, so the cost grows with the logarithm of the number
+        of components rather than linearly. Only integers are probed; booleans
+        and IDs above 2**32 - 1, which no message can have, are never members,
+        not even of '1:*'.
+        """
+        if not isinstance(msg_id, int) or isinstance(msg_id, bool):
+            return False
+        if msg_id > _MAX_ID:
+            return False
+        starts, ends = self._intervals
+        position = bisect_right(starts, msg_id) - 1
+        return position >= 0 and msg_id <= ends[position]
+
+    @classmethod
+    def of(cls, spec: str) -> "MessageSet":
+        """
+        Returns a shared message set for a message set string.
+
+        Parameters
+        ----------
+        spec : str
+            The message set string, e.g. '1:*'.
+
+        Returns
+        -------
+        MessageSet
+            A cached instance, built and validated on the first request for
+            spec.
+
+        Raises
+        ------
+        dataclasses.FrozenInstanceError
+            When msg_ids of the returned instance is reassigned.
+
+        Notes
+        -----
+        The same instance is handed to every caller asking for the same spec, so it
+        is frozen; build a MessageSet of your own to get one that can change.
+        """
+        return _cached_message_set(cls, spec)
+
+    @classmethod
+    def from_range(cls, start: int, end: int) -> "MessageSet":
+        """
+        Builds a message set for the contiguous range start:end.
+
+        Parameters
+        ----------
+        start : int
+            The first message ID of the range.
+        end : int
+            The last message ID of the range.
+
+        Returns
+        -------
+        MessageSet
+            A message set whose msg_ids is 'start:end', or 'start' when both bounds
+            are equal.
+
+        Raises
+        ------
+        ValueError
+            If start is lower than 1 or greater than end, or end is above
+            2**32 - 1.
+
+        Notes
+        -----
+        The bounds are already known, so the string is neither parsed nor
+        validated and the merged intervals are filled in directly.
+        """
+        if start < 1 or end < start or end > _MAX_ID:
+            raise ValueError(f"Invalid range in message IDs: {start}:{end}")
+        message_set = cls.__new__(cls)
+        msg_ids = str(start) if start == end else f"{start}:{end}"
+        object.__setattr__(message_set, "msg_ids", msg_ids)
+        object.__setattr__(
+            message_set, "_bounds", (array("q", (start,)), array("q", (end,)))
+        )
+        return message_set
+
+    def get_first_id(self) -> int:
+        """
+        Returns the lowest message ID in the set.
+
+        Notes
+        -----
+        The merged intervals keep their start and end bounds in two parallel
+        sorted arrays, so this is the first start bound rather than a scan over
+        every component.
+        """
+        return self._intervals[0][0]
+
+    def get_last_id(self) -> Optional[int]:
+        """
+        Returns the highest message ID in the set.
+
+        Returns
         -------
-        Ensures that the msg_ids attribute is always stored as a comma-separated string,
-        which is the expected format for IMAP operations.
+        Optional[int]
+            The last end bound of the merged intervals, or None when the set
+            is open-ended ('1:*') and the highest ID depends on the mailbox.
+        """
+        last = self._intervals[1][-1]
+        return None if last == _OPEN_END else last
+
+    @property
+    def _intervals(self) -> Tuple[array, array]:
+        if self._bounds is None:
+            self._bounds = self._merge_intervals(self.msg_ids)
+        return self._bounds
+
+    @staticmethod
+    def _merge_intervals(msg_ids: str) -> Tuple[array, array]:
+        bounds = []
+        for component in msg_ids.split(","):
+            start, _, end = component.partition(":")
+            if not end:
+                end = start
+            bounds.append((int(start), _OPEN_END if end == "*" else int(end)))
+        bounds.sort()
+
+        starts, ends = array("q"), array("q")
+        for start, end in bounds:
+            if ends and start <= ends[-1] + 1:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+        return starts, ends
+
+    @staticmethod
+    def _optimize_id_string(msg_ids: list) -> str:
+        """
+        Builds the shortest message set string for a list of message IDs.
 
         Notes
         -----
-        If msg_ids is already a string, this method does nothing. If msg_ids is a list,
-        it converts the list to a comma-separated string of message IDs.
+        The IDs are de-duplicated and sorted, then cut wherever the gap to the
+        previous ID is not 1; each run between two cuts becomes a single ID or a
+        'start:end' range. Lists holding anything other than integers or digit
+        strings (booleans included) are joined unchanged so that validation
+        reports the offending value.
         """
-        if isinstance(self.msg_ids, list):
-            self.msg_ids = ",".join(map(str, self.msg_ids))
+        if not all(map(_is_plain_id, msg_ids)):
+            return ",".join(map(str, msg_ids))
+        ids = sorted(set(map(int, msg_ids)))
+        if len(ids) < 2:
+            return ",".join(map(str, ids))
+
+        cuts = [i for i in range(1, len(ids)) if ids[i] - ids[i - 1] != 1]
+        bounds = zip([0, *cuts], [*cuts, len(ids)])
+        return ",".join(
+            str(ids[start]) if end - start == 1 else f"{ids[start]}:{ids[end - 1]}"
+            for start, end in bounds
+        )
 
     def _validate_message_set(self) -> None:
         """
@@ -78,28 +275,74 @@ class MessageSet:
         - For ranges, both start and end IDs are numeric and the start ID is less than
         or equal to the end ID.
         - Supports '1:*' as a valid range from the first message to the last message.
+
+        Well-formed message sets are recognised with a single precompiled regular
+        expression, after which only the order of range bounds is checked.
         """
         if not self.msg_ids:
             raise ValueError("Message IDs cannot be empty")
 
-        if isinstance(self.msg_ids, str):
-            msg_ids_list = self.msg_ids.split(",")
-            for msg_id in msg_ids_list:
-                if ":" in msg_id:
-                    start, end = msg_id.split(":")
-                    if not (
-                        (start.isdigit() or start == "1")
-                        and (end.isdigit() or end == "*")
-                        and (
-                            start.isdigit()
-                            and end.isdigit()
-                            and int(start) <= int(end)
-                            or start == "1"
-                            and end == "*"
-                        )
-                    ):
-                        raise ValueError(f"Invalid range in message IDs: {msg_id}")
-                elif not msg_id.isdigit():
-                    raise ValueError(f"Invalid message ID: {msg_id}")
-        else:
+        if not isinstance(self.msg_ids, str):
             raise TypeError("msg_ids should be a string")
+
+        # Well-formed sets are recognised by one regex pass; only range order
+        # still needs checking. Malformed sets, and sets with IDs long enough to
+        # exceed _MAX_ID, are walked component by component so the error names
+        # the first offending one.
+        if (
+            _MESSAGE_SET_RE.fullmatch(self.msg_ids) is None
+            or _LONG_ID_RE.search(self.msg_ids) is not None
+        ):
+            for msg_id in self.msg_ids.split(","):
+                self._validate_component(msg_id)
+        elif ":" in self.msg_ids:
+            for match in _RANGE_RE.finditer(self.msg_ids):
+                self._validate_range(match.group(), *match.groups())
+
+    @classmethod
+    def _validate_component(cls, msg_id: str) -> None:
+        """
+        Validates a single comma-separated component of the message set.
+
+        Raises
+        ------
+        ValueError
+            If the component is neither a numeric ID up to 2**32 - 1 nor a valid
+            range.
+        """
+        if ":" in msg_id:
+            match = _RANGE_RE.fullmatch(msg_id)
+            if match is None:
+                raise ValueError(f"Invalid range in message IDs: {msg_id}")
+            cls._validate_range(msg_id, *match.groups())
+        elif _ID_RE.fullmatch(msg_id) is None or int(msg_id) > _MAX_ID:
+            raise ValueError(f"Invalid message ID: {msg_id}")
+
+    @staticmethod
+    def _validate_range(msg_id: str, start: str, end: str) -> None:
+        """
+        Validates the bounds of a syntactically valid range component.
+
+        Raises
+        ------
+        ValueError
+            If the start ID is greater than the end ID, the end ID is above
+            2**32 - 1, or an open range does not start at 1.
+        """
+        if end == "*":
+            valid = start == "1"
+        else:
+            valid = int(start) <= int(end) <= _MAX_ID
+        if not valid:
+            raise ValueError(f"Invalid range in message IDs: {msg_id}")
+
+
+@lru_cache(maxsize=256)
+def _cached_message_set(cls: type, spec: str) -> MessageSet:
+    message_set = cls(spec)
+    object.__setattr__(message_set, "_frozen", True)
+    return message_set
+
+
+# Every message in the mailbox; shared and frozen like every set from of().
+MessageSet.ALL = MessageSet.of("1:*")
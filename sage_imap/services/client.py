@@ -1,7 +1,8 @@
 import imaplib
 import logging
 import socket
-from typing import Optional
+from contextlib import contextmanager, suppress
+from typing import Iterator, Optional
 
 from sage_imap.exceptions import (
     IMAPAuthenticationError,
@@ -52,6 +53,8 @@ class IMAPClient:
         Establishes an IMAP connection and logs in (for context manager).
     __exit__(exc_type, exc_value, traceback)
         Logs out from the IMAP server and closes the connection (for context manager).
+    persistent(host, username, password)
+        Yields a client whose connection stays open across ``with`` blocks.
 
     Example
     -------
@@ -66,6 +69,13 @@ class IMAPClient:
     >>> status, messages = client.connection.select("INBOX")
     >>> # Process messages
     >>> client.disconnect()
+
+    Reusing one login across several operations:
+    >>> with IMAPClient.persistent('imap.example.com', 'username', 'password') as c:
+    ...     with c as connection:
+    ...         connection.select("INBOX")
+    ...     with c as connection:
+    ...         connection.select("Sent")
     """
 
     def __init__(self, host: str, username: str, password: str):
@@ -73,6 +83,7 @@ class IMAPClient:
         self.username: str = username
         self.password: str = password
         self.connection: Optional[imaplib.IMAP4_SSL] = None
+        self._persist: bool = False
         logger.debug("IMAPClient initialized with host: %s", self.host)
 
     def connect(self) -> imaplib.IMAP4_SSL:
@@ -122,14 +133,66 @@ class IMAPClient:
             logger.info("Logged in to IMAP server successfully.")
         except imaplib.IMAP4.error as e:
             logger.error("IMAP login failed: %s", e)
+            # Never keep a connection that is not logged in.
+            connection, self.connection = self.connection, None
+            with suppress(OSError):
+                connection.shutdown()
             raise IMAPAuthenticationError("IMAP login failed.") from e
 
         return self.connection
 
     def __enter__(self) -> imaplib.IMAP4_SSL:
         """Establishes an IMAP connection and logs in (for context manager)."""
+        if self._persist and self.connection is not None:
+            try:
+                self.connection.noop()
+                return self.connection
+            except (imaplib.IMAP4.error, OSError) as e:
+                logger.warning("Persistent IMAP connection lost, reconnecting: %s", e)
+                with suppress(OSError):
+                    self.connection.shutdown()
+                self.connection = None
         return self.connect()
 
+    @classmethod
+    @contextmanager
+    def persistent(
+        cls, host: str, username: str, password: str
+    ) -> Iterator["IMAPClient"]:
+        """
+        Yields a client that keeps its connection open across ``with`` blocks.
+
+        Entering the yielded client connects and logs in only the first time;
+        leaving it keeps the session alive. Each later entry checks the session
+        with a NOOP and reconnects if the server has dropped it. The connection
+        is logged out once, when the surrounding ``persistent`` block exits.
+
+        Parameters
+        ----------
+        host : str
+            The hostname of the IMAP server.
+        username : str
+            The username for logging into the IMAP server.
+        password : str
+            The password for logging into the IMAP server.
+
+        Yields
+        ------
+        IMAPClient
+            The client to use as a context manager for each operation.
+        """
+        client = cls(host, username, password)
+        client._persist = True
+        try:
+            yield client
+        finally:
+            client._persist = False
+            # A failed logout must not hide an exception raised in the block.
+            try:
+                client.disconnect()
+            except (IMAPUnexpectedError, OSError) as e:
+                logger.error("Failed to close persistent IMAP connection: %s", e)
+
     def disconnect(self) -> None:
         """
         Logs out from the IMAP server and closes the connection.
@@ -165,4 +228,7 @@ class IMAPClient:
         traceback: Optional[object],
     ) -> None:
         """Logs out from the IMAP server and closes the connection (for context manager)."""
+        if self._persist:
+            logger.debug("Keeping persistent IMAP connection open.")
+            return
         self.disconnect()
@@ -6,12 +6,17 @@ from sage_imap.exceptions import (
     IMAPFolderExistsError,
     IMAPFolderNotFoundError,
     IMAPFolderOperationError,
+    IMAPUnexpectedError,
 )
+from sage_imap.helpers.enums import DefaultMailboxes
 from sage_imap.helpers.typings import Mailbox
 from sage_imap.services.client import IMAPClient
 
 logger = logging.getLogger(__name__)
 
+# LIST response line: (attributes) "delimiter" name
+_LIST_RE = re.compile(rb'\([^)]*\)\s+(?:"[^"]*"|NIL)\s+(.+)$')
+
 
 class IMAPFolderService:
     """A service class for managing IMAP folders.
@@ -50,6 +55,9 @@ class IMAPFolderService:
     >>> folders = folder_service.list_folders()
     """
 
+    # Default mailboxes that delete_folder refuses to remove
+    _PROTECTED = frozenset(mailbox.value for mailbox in DefaultMailboxes)
+
     def __init__(self, client: IMAPClient):
         self.client = client
 
@@ -145,6 +153,13 @@ class IMAPFolderService:
         -------
         >>> folder_service.delete_folder('FolderName')
         """
+        # INBOX is case-insensitive (RFC 3501); other mailbox names are not.
+        if (
+            folder_name in self._PROTECTED
+            or folder_name.upper() == DefaultMailboxes.INBOX
+        ):
+            logger.error("Refusing to delete default folder `%s`.", folder_name)
+            raise IMAPUnexpectedError(f"Cannot delete default folder {folder_name}.")
         try:
             logger.debug("Deleting folder: %s", folder_name)
             status, response = self.client.delete(folder_name)
@@ -263,21 +278,11 @@ class IMAPFolderService:
                 raise IMAPFolderOperationError("Failed to list folders.")
 
             folders = []
-            for folder in response:
-                # Decode the byte object to a string
-                folder_str = folder.decode("utf-8")
-
-                # Use regular expression to extract the folder name
-                match = re.search(r'\s+"(.+?)"$', folder_str)
-                if match:
-                    # Extract the folder name from the match
-                    folder_name = match.group(1)
-                    folders.append(folder_name)
-                else:
-                    # Handle cases where the folder name is not in the expected format
-                    parts = folder_str.split(" ")
-                    folder_name = parts[-1].strip('"')
-                    folders.append(folder_name)
+            for line in response:
+                # Match on the raw bytes and decode only the folder name
+                match = _LIST_RE.match(line)
+                name = match.group(1) if match else line.rpartition(b" ")[2]
+                folders.append(name.strip(b'"').decode("utf-8"))
 
             logger.debug("Successfully listed folders: %s", folders)
             return folders
@@ -301,7 +301,9 @@ class IMAPMailboxService(BaseMailboxService):
     @mailbox_selection_required
     def fetch(self, msg_set: MessageSet, msg_part: MessagePart):
         try:
-            print(f"Fetching message part {msg_part} for messages {msg_set}.")
+            logger.debug(
+                "Fetching message part %s for messages %s.", msg_part, msg_set.msg_ids
+            )
             status, data = self.client.fetch(msg_set.msg_ids, f"({msg_part} FLAGS UID)")
 
             if status != "OK":
@@ -309,13 +311,16 @@ class IMAPMailboxService(BaseMailboxService):
                     f"Failed to fetch message part {msg_part} for messages {msg_set}."
                 )
 
+            headers_only = "HEADER" in msg_part
             fetched_data = []
             for response_part in data:
                 if isinstance(response_part, tuple):
                     flag_data = response_part[0]
                     msg_data = response_part[1]
 
-                    email_message = EmailMessage.read_from_eml_bytes(msg_data)
+                    email_message = EmailMessage.read_from_eml_bytes(
+                        msg_data, headers_only=headers_only
+                    )
 
                     # Extract flags
                     flags = EmailMessage.extract_flags(flag_data)
@@ -335,13 +340,18 @@ class IMAPMailboxService(BaseMailboxService):
 
                     fetched_data.append(email_message)
 
-            print(
-                f"Fetched message part {msg_part} for messages {msg_set} successfully."
+            logger.info(
+                "Fetched message part %s for messages %s successfully.",
+                msg_part,
+                msg_set.msg_ids,
             )
             return fetched_data
         except Exception as e:
-            print(
-                f"Exception occurred while fetching message part {msg_part} for messages {msg_set}: {e}"
+            logger.error(
+                "Exception occurred while fetching message part %s for messages %s: %s",
+                msg_part,
+                msg_set.msg_ids,
+                e,
             )
             raise Exception(
                 f"Failed to fetch message part {msg_part} for messages {msg_set}."
@@ -597,7 +607,9 @@ class IMAPMailboxUIDService(BaseMailboxService):
     @mailbox_selection_required
     def uid_fetch(self, msg_set: MessageSet, msg_part: MessagePart):
         try:
-            print(f"Fetching message part {msg_part} for messages {msg_set}.")
+            logger.debug(
+                "Fetching message part %s for messages %s.", msg_part, msg_set.msg_ids
+            )
             status, data = self.client.uid(
                 "FETCH", msg_set.msg_ids, f"({msg_part} FLAGS UID)"
             )
@@ -607,14 +619,16 @@ class IMAPMailboxUIDService(BaseMailboxService):
                     f"Failed to fetch message part {msg_part} for messages {msg_set}."
                 )
 
-            breakpoint()
+            headers_only = "HEADER" in msg_part
             fetched_data = []
             for response_part in data:
                 if isinstance(response_part, tuple):
                     flag_data = response_part[0]
                     msg_data = response_part[1]
 
-                    email_message = EmailMessage.read_from_eml_bytes(msg_data)
+                    email_message = EmailMessage.read_from_eml_bytes(
+                        msg_data, headers_only=headers_only
+                    )
 
                     # Extract flags
                     flags = EmailMessage.extract_flags(flag_data)
@@ -634,13 +648,18 @@ class IMAPMailboxUIDService(BaseMailboxService):
 
                     fetched_data.append(email_message)
 
-            print(
-                f"Fetched message part {msg_part} for messages {msg_set} successfully."
+            logger.info(
+                "Fetched message part %s for messages %s successfully.",
+                msg_part,
+                msg_set.msg_ids,
             )
             return fetched_data
         except Exception as e:
-            print(
-                f"Exception occurred while fetching message part {msg_part} for messages {msg_set}: {e}"
+            logger.error(
+                "Exception occurred while fetching message part %s for messages %s: %s",
+                msg_part,
+                msg_set.msg_ids,
+                e,
             )
             raise Exception(
                 f"Failed to fetch message part {msg_part} for messages {msg_set}."
@@ -1,3 +1,12 @@
+from typing import Any
+
 from sage_imap.exceptions import IMAPMailboxSelectionError as IMAPMailboxSelectionError
 
 def mailbox_selection_required(func): ...
+
+class cached_property:
+    func: Any
+    name: str
+    def __init__(self, func) -> None: ...
+    def __set_name__(self, owner, name: str) -> None: ...
+    def __get__(self, instance, owner=None): ...
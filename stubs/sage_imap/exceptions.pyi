@@ -1,11 +1,10 @@
-from _typeshed import Incomplete
-
 class IMAPClientError(Exception):
     status_code: int
     default_detail: str
     default_code: str
-    detail: Incomplete
-    code: Incomplete
+    detail: str
+    code: str
+    def __init_subclass__(cls, **kwargs) -> None: ...
     def __init__(
         self,
         detail: str | None = None,
@@ -2,7 +2,7 @@ from _typeshed import Incomplete
 
 MessageId = str | int
 MessageIDList = list[MessageId]
-MessageSetType = str | MessageIDList
+MessageSetType = str | bytes | MessageIDList
 EmailDate: Incomplete
 EmailHeaders = dict[str, str]
 EmailAddress: Incomplete
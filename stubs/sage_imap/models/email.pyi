@@ -1,16 +1,17 @@
 import email
 from _typeshed import Incomplete
 from dataclasses import dataclass
+from datetime import datetime
 from sage_imap.helpers.enums import Flag as Flag
 from sage_imap.helpers.typings import (
     EmailAddress as EmailAddress,
     EmailDate as EmailDate,
 )
-from typing import Any, Callable
+from typing import Any, Callable, Iterator, Sequence
 
 logger: Incomplete
 
-@dataclass
+@dataclass(slots=True)
 class Attachment:
     filename: str
     content_type: str
@@ -18,6 +19,9 @@ class Attachment:
     id: str | None = ...
     content_id: str | None = ...
     content_transfer_encoding: str | None = ...
+    size: int | None = ...
+    def __post_init__(self) -> None: ...
+    def save_to_file(self, directory: str) -> str: ...
     def __init__(
         self,
         filename,
@@ -26,6 +30,7 @@ class Attachment:
         id=...,
         content_id=...,
         content_transfer_encoding=...,
+        size=...,
     ) -> None: ...
 
 @dataclass
@@ -48,11 +53,15 @@ class EmailMessage:
     uid: int | None = ...
     def __post_init__(self) -> None: ...
     @classmethod
-    def read_from_eml_file(cls, file_path: str) -> EmailMessage: ...
+    def read_from_eml_file(
+        cls, file_path: str, headers_only: bool = ...
+    ) -> EmailMessage: ...
     @classmethod
-    def read_from_eml_bytes(cls, eml_bytes: bytes) -> EmailMessage: ...
-    def parse_eml_content(self) -> None: ...
-    def sanitize_message_id(self, message_id: str) -> str | None: ...
+    def read_from_eml_bytes(
+        cls, eml_bytes: bytes, headers_only: bool = ...
+    ) -> EmailMessage: ...
+    def parse_eml_content(self, headers_only: bool = ...) -> None: ...
+    def sanitize_message_id(self, message_id: str | None) -> str | None: ...
     def parse_date(self, date_str: str | None) -> EmailDate | None: ...
     def extract_body(self, message: email.message.EmailMessage) -> tuple[str, str]: ...
     def extract_attachments(
@@ -61,8 +70,45 @@ class EmailMessage:
     @staticmethod
     def extract_flags(flag_data: bytes) -> list[Flag]: ...
     def decode_payload(self, part: email.message.EmailMessage) -> str: ...
+    @property
+    def all_recipients(self) -> tuple[EmailAddress, ...]: ...
+    @property
+    def total_attachment_size(self) -> int: ...
+    @property
+    def content_type_bits(self) -> int: ...
+    def get_attachments_by_type(self, content_type: str) -> list[Attachment]: ...
+    @property
+    def date_timestamp(self) -> float: ...
+    @property
+    def content_hash(self) -> str: ...
+    @property
+    def flag_mask(self) -> int: ...
+    @property
+    def subject_lower(self) -> str: ...
+    @property
+    def html_text(self) -> str: ...
+    def get_body_preview(self, max_length: int = ...) -> str: ...
+    @property
+    def sender_key(self) -> str: ...
+    @property
+    def recipient_keys(self) -> frozenset[str]: ...
+    @property
+    def plain_body_lower(self) -> str: ...
+    @property
+    def html_body_lower(self) -> str: ...
+    def is_reply(self) -> bool: ...
+    def is_forward(self) -> bool: ...
+    @property
+    def body_flags(self) -> int: ...
+    @property
+    def is_multipart(self) -> bool: ...
     def has_attachments(self) -> bool: ...
+    def has_plain_body(self) -> bool: ...
+    def has_html_body(self) -> bool: ...
+    @property
+    def attachment_count(self) -> int: ...
     def get_attachment_filenames(self) -> list[str]: ...
+    def to_dict(self) -> dict[str, Any]: ...
     def write_to_eml_file(self, file_path: str) -> None: ...
     def __init__(
         self,
@@ -85,19 +131,102 @@ class EmailMessage:
     ) -> None: ...
 
 class EmailIterator:
-    def __init__(self, email_list: list[EmailMessage]) -> None: ...
+    def __init__(
+        self,
+        email_list: Sequence[EmailMessage],
+        filtered_indices: Sequence[int] | None = ...,
+    ) -> None: ...
+    @classmethod
+    def from_mbox(cls, file_path: str) -> EmailIterator: ...
+    def close(self) -> None: ...
+    def refresh(self) -> None: ...
+    def __enter__(self) -> EmailIterator: ...
+    def __exit__(
+        self,
+        exc_type: type | None,
+        exc_value: BaseException | None,
+        traceback: object | None,
+    ) -> None: ...
     def __iter__(self) -> EmailIterator: ...
     def __next__(self) -> EmailMessage: ...
     def __getitem__(self, index: int | slice) -> EmailMessage | EmailIterator: ...
     def __len__(self) -> int: ...
+    def take(self, count: int) -> EmailIterator: ...
+    def skip(self, count: int) -> EmailIterator: ...
+    def page(self, page_number: int, page_size: int) -> EmailIterator: ...
+    def page_after(
+        self, cursor: str | None, page_size: int
+    ) -> tuple[list[EmailMessage], str | None]: ...
+    def chain(self, *others: EmailIterator) -> EmailIterator: ...
     def reset(self) -> None: ...
     def current_position(self) -> int: ...
     def __reversed__(self) -> EmailIterator: ...
     def __contains__(self, item: EmailMessage) -> bool: ...
     def count(self, condition: Callable[[EmailMessage], bool]) -> int: ...
+    def find_all(
+        self, condition: Callable[[EmailMessage], bool]
+    ) -> list[EmailMessage]: ...
+    def find_all_by_column(
+        self, column: str, op: Callable[[Any, Any], bool], value: Any
+    ) -> list[EmailMessage]: ...
+    def count_by_column(
+        self, column: str, op: Callable[[Any, Any], bool], value: Any
+    ) -> int: ...
     def filter(self, criteria: Callable[[EmailMessage], bool]) -> EmailIterator: ...
+    def deduplicate(
+        self, key: Callable[[EmailMessage], Any] | None = ...
+    ) -> EmailIterator: ...
     def filter_by_header(self, key: str) -> EmailIterator: ...
-    def filter_by_subject_part(self, part: str) -> EmailIterator: ...
+    def filter_by_subject_part(
+        self, part: str, case_sensitive: bool = ...
+    ) -> EmailIterator: ...
+    def filter_by_subject_regex(
+        self, pattern: str, flags: int = ...
+    ) -> EmailIterator: ...
+    def filter_by_sender(
+        self, sender: str, exact_match: bool = ...
+    ) -> EmailIterator: ...
+    def filter_by_senders(self, senders: Sequence[str]) -> EmailIterator: ...
+    def filter_by_recipient(
+        self, recipient: str, exact_match: bool = ...
+    ) -> EmailIterator: ...
+    def filter_by_body_content(
+        self,
+        content: str,
+        html_only: bool = ...,
+        plain_only: bool = ...,
+        case_sensitive: bool = ...,
+    ) -> EmailIterator: ...
     def find_by_message_id(self, message_id: str) -> EmailMessage | None: ...
+    def filter_by_content_type(self, content_type: str) -> EmailIterator: ...
+    def filter_by_size_range(
+        self, min_size: int = ..., max_size: int | None = ...
+    ) -> EmailIterator: ...
+    def filter_by_attachment_count(
+        self, min_count: int = ..., max_count: int | None = ...
+    ) -> EmailIterator: ...
+    def filter_by_flags(
+        self, flags: list[Flag], match_all: bool = ...
+    ) -> EmailIterator: ...
+    def filter_by_date_range(self, start: datetime, end: datetime) -> EmailIterator: ...
+    def sort_by_date(self, reverse: bool = ...) -> EmailIterator: ...
+    def sort_by_size(self, reverse: bool = ...) -> EmailIterator: ...
+    def sort_by_attachment_count(self, reverse: bool = ...) -> EmailIterator: ...
+    def sort_by_subject(self, reverse: bool = ...) -> EmailIterator: ...
+    def sort_by_sender(self, reverse: bool = ...) -> EmailIterator: ...
+    def get_date_range(self) -> tuple[EmailDate, EmailDate] | None: ...
+    def get_unique_senders(self) -> set[EmailAddress]: ...
+    def get_unique_recipients(self) -> set[EmailAddress]: ...
+    def group_by_sender(self) -> dict[EmailAddress, EmailIterator]: ...
+    def group_by_date(self) -> dict[str, EmailIterator]: ...
+    def to_dicts(self) -> Iterator[dict[str, Any]]: ...
+    def to_dict_list(self) -> list[dict[str, Any]]: ...
+    def save_all_to_directory(
+        self, directory: str, max_workers: int | None = ...
+    ) -> list[str]: ...
     def filter_by_attachment(self) -> EmailIterator: ...
+    def filter_by_html_body(self) -> EmailIterator: ...
+    def filter_multipart(self) -> EmailIterator: ...
     def get_total_size(self) -> int: ...
+    def get_statistics(self) -> dict[str, Any]: ...
+    def get_total_attachment_size(self) -> int: ...
@@ -1,9 +1,18 @@
+from typing import Any, ClassVar
 from dataclasses import dataclass
 from enum import StrEnum as StrEnum
 from sage_imap.helpers.typings import MessageSetType as MessageSetType
 
-@dataclass
+@dataclass(slots=True)
 class MessageSet:
+    ALL: ClassVar[MessageSet]
     msg_ids: MessageSetType = ...
-    def __post_init__(self) -> None: ...
+    def __setattr__(self, name: str, value: Any) -> None: ...
+    def __contains__(self, msg_id: object) -> bool: ...
+    @classmethod
+    def of(cls, spec: str) -> MessageSet: ...
+    @classmethod
+    def from_range(cls, start: int, end: int) -> MessageSet: ...
+    def get_first_id(self) -> int: ...
+    def get_last_id(self) -> int | None: ...
     def __init__(self, msg_ids=...) -> None: ...
@@ -1,5 +1,6 @@
 import imaplib
 from _typeshed import Incomplete
+from typing import ContextManager
 from sage_imap.exceptions import (
     IMAPAuthenticationError as IMAPAuthenticationError,
     IMAPConnectionError as IMAPConnectionError,
@@ -15,6 +16,10 @@ class IMAPClient:
     connection: Incomplete
     def __init__(self, host: str, username: str, password: str) -> None: ...
     def __enter__(self) -> imaplib.IMAP4_SSL: ...
+    @classmethod
+    def persistent(
+        cls, host: str, username: str, password: str
+    ) -> ContextManager[IMAPClient]: ...
     def __exit__(
         self,
         exc_type: type | None,
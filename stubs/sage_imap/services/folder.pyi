@@ -3,7 +3,9 @@ from sage_imap.exceptions import (
     IMAPFolderExistsError as IMAPFolderExistsError,
     IMAPFolderNotFoundError as IMAPFolderNotFoundError,
     IMAPFolderOperationError as IMAPFolderOperationError,
+    IMAPUnexpectedError as IMAPUnexpectedError,
 )
+from sage_imap.helpers.enums import DefaultMailboxes as DefaultMailboxes
 from sage_imap.helpers.typings import Mailbox as Mailbox
 from sage_imap.services.client import IMAPClient as IMAPClient
 
@@ -0,0 +1,21 @@
+import socket
+from unittest import mock
+
+import pytest
+
+_real_connect = socket.socket.connect
+
+
+def _local_connect_only(sock, address):
+    # Unix sockets stay usable; anything that would reach the network fails fast.
+    if sock.family == getattr(socket, "AF_UNIX", None):
+        return _real_connect(sock, address)
+    raise OSError(f"Network access is disabled during tests: {address!r}")
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _no_network():
+    with mock.patch.object(
+        socket.socket, "connect", _local_connect_only
+    ), mock.patch("socket.gethostbyname", return_value="127.0.0.1"):
+        yield
@@ -0,0 +1,1144 @@
+import operator
+import os
+from datetime import datetime, timezone
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+import pytest
+
+from sage_imap.helpers.enums import Flag
+from sage_imap.models.email import (
+    Attachment,
+    EmailIterator,
+    EmailMessage,
+    _header_body_split,
+)
+
+
+@pytest.fixture(scope="module")
+def raw_email():
+    message = MIMEMultipart()
+    message["Message-ID"] = "<abc123@example.com>"
+    message["Subject"] = "Test Subject"
+    message["From"] = "sender@example.com"
+    message["To"] = "first@example.com, second@example.com"
+    message["Cc"] = "cc@example.com"
+    message["Date"] = "Thu, 13 Jul 2023 12:00:00 +0000"
+    message.attach(MIMEText("This is the body of the email", "plain"))
+    return message.as_bytes()
+
+
+def email_with_attachments(*content_types, **fields):
+    # One empty attachment per content type, in order.
+    attachments = [
+        Attachment(filename="f", content_type=content_type, payload=b"")
+        for content_type in content_types
+    ]
+    return EmailMessage(message_id="", attachments=attachments, **fields)
+
+
+def test_parse_email_addresses(raw_email):
+    email_message = EmailMessage.read_from_eml_bytes(raw_email)
+    assert email_message.to_address == ["first@example.com, second@example.com"]
+    assert email_message.cc_address == ["cc@example.com"]
+    assert email_message.bcc_address == []
+
+
+def test_parse_email_addresses_skips_empty():
+    email_message = EmailMessage(message_id="")
+    assert email_message._parse_email_addresses(["a@example.com", "", None]) == [
+        "a@example.com"
+    ]
+
+
+@pytest.mark.parametrize(
+    "content_type,expected",
+    [
+        ("text/plain", ".txt"),
+        ("image/jpeg", ".jpg"),
+        ("application/pdf", ".pdf"),
+        ("application/x-unknown-type", ".bin"),
+    ],
+)
+def test_get_extension_from_content_type(content_type, expected):
+    assert EmailMessage._get_extension_from_content_type(content_type) == expected
+
+
+def test_extract_attachments_no_filename():
+    message = MIMEMultipart()
+    message["Message-ID"] = "<abc123@example.com>"
+    part = MIMEApplication(b"%PDF-1.4", "pdf")
+    part.add_header("Content-Disposition", "attachment")
+    message.attach(part)
+    email_message = EmailMessage.read_from_eml_bytes(message.as_bytes())
+    assert email_message.get_attachment_filenames() == ["attachment.pdf"]
+
+
+def test_extract_flags():
+    flag_data = b"1 (FLAGS (\\Seen \\Answered \\Flagged $Custom) UID 42 RFC822 {10}"
+    assert EmailMessage.extract_flags(flag_data) == [
+        Flag.SEEN,
+        Flag.ANSWERED,
+        Flag.FLAGGED,
+    ]
+
+
+@pytest.mark.parametrize("flag_data", [None, b"", b"1 (UID 42)", b"FLAGS (\\Seen"])
+def test_extract_flags_missing(flag_data):
+    assert EmailMessage.extract_flags(flag_data) == []
+
+
+def test_attachment_save_to_file_with_conflict(tmp_path):
+    attachment = Attachment(
+        filename="test.txt", content_type="text/plain", payload=b"content"
+    )
+    first = attachment.save_to_file(str(tmp_path / "out"))
+    second = attachment.save_to_file(str(tmp_path / "out"))
+    third = attachment.save_to_file(str(tmp_path / "out"))
+    assert os.path.basename(first) == "test.txt"
+    assert os.path.basename(second) == "test_1.txt"
+    assert os.path.basename(third) == "test_2.txt"
+    with open(third, "rb") as f:
+        assert f.read() == b"content"
+
+
+def test_attachment_save_to_file_keeps_existing_files(tmp_path):
+    (tmp_path / "report.pdf").write_bytes(b"old")
+    (tmp_path / "report_1.pdf").mkdir()
+    attachment = Attachment(
+        filename="report.pdf", content_type="application/pdf", payload=b"new"
+    )
+    saved = attachment.save_to_file(str(tmp_path))
+    assert os.path.basename(saved) == "report_2.pdf"
+    assert (tmp_path / "report.pdf").read_bytes() == b"old"
+    assert (tmp_path / "report_2.pdf").read_bytes() == b"new"
+
+
+def test_email_iterator_from_mbox(tmp_path, raw_email):
+    second = raw_email.replace(b"abc123@example.com", b"def456@example.com")
+    mbox_path = tmp_path / "inbox.mbox"
+    mbox_path.write_bytes(
+        b"From sender@example.com Thu Jul 13 12:00:00 2023\n"
+        + raw_email
+        + b"\n\nFrom sender@example.com Thu Jul 13 12:00:01 2023\n"
+        + second
+        + b"\n"
+    )
+    emails = EmailIterator.from_mbox(str(mbox_path))
+    assert len(emails) == 2
+    assert [e.message_id for e in emails] == [
+        "<abc123@example.com>",
+        "<def456@example.com>",
+    ]
+    assert emails[1].subject == "Test Subject"
+    assert len(emails[1:]) == 1
+
+
+def test_email_iterator_from_mbox_close(tmp_path, raw_email):
+    mbox_path = tmp_path / "inbox.mbox"
+    mbox_path.write_bytes(b"From sender@example.com\n" + raw_email)
+    with EmailIterator.from_mbox(str(mbox_path)) as emails:
+        view = emails[:1]
+        assert view[0].message_id == "<abc123@example.com>"
+    assert emails._email_list._buffer.closed
+    with pytest.raises(ValueError):
+        view[0]
+
+    in_memory = EmailIterator([EmailMessage(message_id="")])
+    in_memory.close()
+    assert len(list(in_memory)) == 1
+
+
+def test_email_iterator_from_empty_mbox(tmp_path):
+    mbox_path = tmp_path / "empty.mbox"
+    mbox_path.write_bytes(b"")
+    assert len(EmailIterator.from_mbox(str(mbox_path))) == 0
+
+
+@pytest.mark.parametrize(
+    "header,expected",
+    [
+        ("=?utf-8?Q?Test_Subject?=", "Test Subject"),
+        ("Plain Subject", "Plain Subject"),
+        ("", ""),
+        (None, ""),
+    ],
+)
+def test_safe_header_decode(header, expected):
+    assert EmailMessage(message_id="")._safe_header_decode(header) == expected
+
+
+def test_safe_header_decode_error(caplog):
+    # An unknown charset cannot be decoded, the raw header is kept instead.
+    caplog.set_level("WARNING", logger="sage_imap.models.email")
+    header = "=?x-unknown?Q?Test?="
+    assert EmailMessage(message_id="")._safe_header_decode(header) == header
+    assert [r.levelname for r in caplog.records] == ["WARNING"]
+
+
+@pytest.mark.parametrize(
+    "message_id,expected",
+    [
+        ("<abc123@example.com>", "<abc123@example.com>"),
+        ("  <abc123@example.com>  ", "<abc123@example.com>"),
+        ("<abc@x> (comment)", "<abc@x>"),
+        ("<12345.JavaMail>", "<12345.JavaMail>"),
+        ("<first@x> <second@x>", "<first@x>"),
+        ("abc123@example.com", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_sanitize_message_id(message_id, expected):
+    assert EmailMessage(message_id="").sanitize_message_id(message_id) == expected
+
+
+def test_parse_date_valid():
+    email_message = EmailMessage(message_id="")
+    assert (
+        email_message.parse_date("Thu, 13 Jul 2023 12:00:00 +0000")
+        == "2023-07-13T12:00:00+00:00"
+    )
+
+
+@pytest.mark.parametrize("date_str", [None, "", "not a date"])
+def test_parse_date_invalid(date_str):
+    assert EmailMessage(message_id="").parse_date(date_str) is None
+
+
+def test_decode_payload_list():
+    message = MIMEMultipart("alternative")
+    message.attach(MIMEText("first ", "plain"))
+    message.attach(MIMEText("second", "plain"))
+    assert EmailMessage(message_id="").decode_payload(message) == "first second"
+
+
+def test_decode_payload_unknown_charset():
+    part = MIMEText("café", "plain", "utf-8")
+    part.set_param("charset", "x-unknown")
+    assert EmailMessage(message_id="").decode_payload(part) == "café"
+
+
+def test_all_recipients_property():
+    email_message = EmailMessage(
+        message_id="",
+        to_address=["to@example.com"],
+        cc_address=["cc@example.com"],
+        bcc_address=["bcc@example.com"],
+    )
+    assert email_message.all_recipients == (
+        "to@example.com",
+        "cc@example.com",
+        "bcc@example.com",
+    )
+
+
+def test_extract_attachments_skips_inline_parts():
+    message = MIMEMultipart()
+    message["Message-ID"] = "<abc123@example.com>"
+    inline = MIMEText("inline body", "plain")
+    inline.add_header("Content-Disposition", "inline", filename="attachment.txt")
+    message.attach(inline)
+    attached = MIMEText("attached body", "plain")
+    attached.add_header("Content-Disposition", "ATTACHMENT", filename="notes.txt")
+    message.attach(attached)
+    email_message = EmailMessage.read_from_eml_bytes(message.as_bytes())
+    assert email_message.get_attachment_filenames() == ["notes.txt"]
+    assert email_message.attachments[0].payload == b"attached body"
+    assert email_message.plain_body == "inline body"
+
+
+def test_read_from_eml_bytes_headers_only(raw_email):
+    email_message = EmailMessage.read_from_eml_bytes(raw_email, headers_only=True)
+    assert email_message.message_id == "<abc123@example.com>"
+    assert email_message.subject == "Test Subject"
+    assert email_message.plain_body == ""
+    assert email_message.attachments == []
+
+    email_message.parse_eml_content()
+    assert email_message.plain_body == "This is the body of the email"
+
+
+@pytest.mark.parametrize(
+    "raw,expected",
+    [
+        (b"A: 1\r\nB: 2\r\n\r\nbody\r\n", (b"A: 1\r\nB: 2\r\n", b"body\r\n")),
+        (b"A: 1\nB: 2\n\nbody\n", (b"A: 1\nB: 2\n", b"body\n")),
+        (b"A: 1\n\nbody\r\n\r\nmore", (b"A: 1\n", b"body\r\n\r\nmore")),
+        (b"A: 1\r\n", (b"A: 1\r\n", b"")),
+    ],
+)
+def test_header_body_split(raw, expected):
+    assert _header_body_split(raw) == expected
+
+
+def test_total_attachment_size_property():
+    email_message = EmailMessage(
+        message_id="",
+        attachments=[
+            Attachment(filename="a.txt", content_type="text/plain", payload=b"1234"),
+            Attachment(filename="b.txt", content_type="text/plain", payload=b"56"),
+        ],
+    )
+    assert email_message.total_attachment_size == 6
+
+    email_message.attachments = email_message.attachments[:1]
+    assert email_message.total_attachment_size == 4
+
+    emails = EmailIterator([email_message, email_message])
+    assert emails.get_total_attachment_size() == 8
+
+
+def test_get_attachments_by_type():
+    image = Attachment(filename="a.png", content_type="image/png", payload=b"")
+    text = Attachment(filename="b.txt", content_type="text/plain", payload=b"")
+    jpeg = Attachment(filename="c.jpg", content_type="image/jpeg", payload=b"")
+    email_message = EmailMessage(message_id="", attachments=[image, text, jpeg])
+    assert email_message.get_attachments_by_type("image/") == [image, jpeg]
+    assert email_message.get_attachments_by_type("text/plain") == [text]
+    assert email_message.get_attachments_by_type("application/") == []
+
+    email_message.attachments = [text]
+    assert email_message.get_attachments_by_type("image/") == []
+
+    emails = EmailIterator(
+        [email_message, EmailMessage(message_id="", attachments=[image])]
+    )
+    assert len(emails.filter_by_content_type("image/")) == 1
+
+
+@pytest.mark.parametrize(
+    "subject,is_reply,is_forward",
+    [
+        ("Re: Meeting", True, False),
+        ("  RE : Meeting", True, False),
+        ("Fwd: Meeting", False, True),
+        ("FW: Meeting", False, True),
+        ("Meeting Re: agenda", False, False),
+        ("", False, False),
+    ],
+)
+def test_is_reply_and_is_forward(subject, is_reply, is_forward):
+    email_message = EmailMessage(message_id="", subject=subject)
+    assert email_message.is_reply() is is_reply
+    assert email_message.is_forward() is is_forward
+
+
+def test_email_iterator_filter_by_subject_regex():
+    emails = EmailIterator(
+        [
+            EmailMessage(message_id="", subject="Invoice #123"),
+            EmailMessage(message_id="", subject="Meeting notes"),
+        ]
+    )
+    filtered = emails.filter_by_subject_regex(r"invoice #\d+")
+    assert [email.subject for email in filtered] == ["Invoice #123"]
+
+
+def test_email_iterator_filter_by_subject_part():
+    first = EmailMessage(message_id="", subject="First Test Email")
+    second = EmailMessage(message_id="", subject="Second email")
+    emails = EmailIterator([first, second])
+    assert list(emails.filter_by_subject_part("test")) == [first]
+    assert list(emails.filter_by_subject_part("EMAIL")) == [first, second]
+    assert list(emails.filter_by_subject_part("Email", case_sensitive=True)) == [
+        first
+    ]
+
+    second.subject = "Second test"
+    assert list(emails.filter_by_subject_part("test")) == [first, second]
+
+
+def test_email_iterator_filter_returns_view():
+    emails = [
+        EmailMessage(message_id="", subject=f"Email {i}", size=i * 100)
+        for i in range(5)
+    ]
+    iterator = EmailIterator(emails)
+    assert iterator._filtered_indices is None
+
+    filtered = iterator.filter(lambda email: email.size >= 200)
+    assert filtered._email_list is emails
+    assert list(filtered._filtered_indices) == [2, 3, 4]
+    assert len(filtered) == 3
+    assert filtered[0] is emails[2]
+    assert emails[1] not in filtered
+    assert emails[3] in filtered
+
+    chained = filtered.filter(lambda email: email.size <= 300)
+    assert list(chained) == [emails[2], emails[3]]
+    assert list(filtered[1:]) == [emails[3], emails[4]]
+    assert filtered.get_total_size() == 900
+    with pytest.raises(IndexError):
+        filtered[3]
+
+
+def test_email_iterator_filter_by_size_range():
+    emails = EmailIterator(
+        [EmailMessage(message_id="", size=size) for size in (100, 150, 200, 400)]
+    )
+    assert emails.get_total_size() == 850
+    in_range = emails.filter_by_size_range(120, 300)
+    assert [email.size for email in in_range] == [150, 200]
+    assert in_range.get_total_size() == 350
+    assert len(emails.filter_by_size_range(min_size=200)) == 2
+    assert in_range._columns is emails._columns
+
+
+def test_email_iterator_caches_follow_email_changes():
+    emails = [EmailMessage(message_id=f"{i}@example.com", size=i) for i in (1, 2)]
+    iterator = EmailIterator(emails)
+    view = iterator.take(2)
+    has_size = operator.attrgetter("size")
+    assert iterator.get_total_size() == 3
+    assert len(iterator.filter(has_size)) == 2
+    assert iterator.find_by_message_id("1@example.com") is emails[0]
+
+    emails[0].size = 100
+    emails[1].message_id = "new@example.com"
+    assert iterator.get_total_size() == 102
+    assert view.get_total_size() == 102
+    emails[1].size = 0
+    assert len(iterator.filter(has_size)) == 1
+    assert iterator.find_by_message_id("new@example.com") is None
+
+    view.refresh()
+    assert [e.size for e in iterator.sort_by_size(reverse=True)] == [100, 0]
+    assert iterator.find_by_message_id("new@example.com") is emails[1]
+
+    emails.append(EmailMessage(message_id="3@example.com", size=3))
+    assert iterator.find_by_message_id("3@example.com") is emails[2]
+    assert [e.size for e in iterator.sort_by_size()] == [0, 3, 100]
+
+
+def test_email_iterator_filter_by_flags():
+    seen = EmailMessage(message_id="", flags=[Flag.SEEN])
+    seen_flagged = EmailMessage(message_id="", flags=[Flag.SEEN, Flag.FLAGGED])
+    unread = EmailMessage(message_id="")
+    emails = EmailIterator([seen, seen_flagged, unread])
+    assert list(emails.filter_by_flags([Flag.SEEN, Flag.FLAGGED])) == [seen_flagged]
+    assert list(emails.filter_by_flags([Flag.FLAGGED, Flag.SEEN], False)) == [
+        seen,
+        seen_flagged,
+    ]
+    assert list(emails.filter_by_flags(["\\Seen"])) == [seen, seen_flagged]
+
+
+def test_email_iterator_dates():
+    first = EmailMessage(message_id="", date="2023-07-13T12:00:00+00:00")
+    second = EmailMessage(message_id="", date="2023-07-10T08:30:00+00:00")
+    third = EmailMessage(message_id="", date="2023-07-20T18:00:00+00:00")
+    undated = EmailMessage(message_id="")
+    emails = EmailIterator([first, second, third, undated])
+
+    in_range = emails.filter_by_date_range(
+        datetime(2023, 7, 11, tzinfo=timezone.utc),
+        datetime(2023, 7, 31, tzinfo=timezone.utc),
+    )
+    assert list(in_range) == [first, third]
+    assert list(emails.sort_by_date()) == [second, first, third, undated]
+    assert list(emails.sort_by_date(reverse=True)) == [third, first, second, undated]
+    assert emails.get_date_range() == (second.date, third.date)
+    assert EmailIterator([undated]).get_date_range() is None
+
+
+def test_email_iterator_group_by_sender():
+    alice = EmailMessage(message_id="", from_address="alice@example.com")
+    bob = EmailMessage(message_id="", from_address="bob@example.com")
+    alice_again = EmailMessage(message_id="", from_address="alice@example.com")
+    anonymous = EmailMessage(message_id="")
+    emails = EmailIterator([alice, bob, alice_again, anonymous])
+
+    assert emails.get_unique_senders() == {"alice@example.com", "bob@example.com"}
+    groups = emails.group_by_sender()
+    assert list(groups["alice@example.com"]) == [alice, alice_again]
+    assert list(groups["bob@example.com"]) == [bob]
+    assert len(groups) == 2
+
+
+def test_parsed_sender_is_interned(raw_email):
+    first = EmailMessage.read_from_eml_bytes(raw_email)
+    second = EmailMessage.read_from_eml_bytes(raw_email)
+    assert first.from_address == "sender@example.com"
+    assert first.from_address is second.from_address
+
+
+def test_write_to_eml_file(tmp_path, raw_email):
+    email_message = EmailMessage.read_from_eml_bytes(raw_email)
+    email_message.write_to_eml_file(str(tmp_path / "nested" / "message"))
+    assert (tmp_path / "nested" / "message.eml").read_bytes() == raw_email
+
+
+def test_write_to_eml_file_without_raw(tmp_path):
+    email_message = EmailMessage(message_id="<a@example.com>")
+    with pytest.raises(ValueError, match="no raw content"):
+        email_message.write_to_eml_file(str(tmp_path / "message"))
+    assert not (tmp_path / "message.eml").exists()
+
+
+def test_email_iterator_save_all_to_directory(tmp_path, raw_email):
+    first = EmailMessage.read_from_eml_bytes(raw_email)
+    first.uid = 42
+    second = EmailMessage.read_from_eml_bytes(raw_email)
+    saved = EmailIterator([first, second]).save_all_to_directory(str(tmp_path))
+    assert sorted(os.path.basename(path) for path in saved) == ["1.eml", "42.eml"]
+    assert (tmp_path / "42.eml").read_bytes() == raw_email
+
+
+def test_email_iterator_save_all_to_directory_unique_names(tmp_path, raw_email):
+    emails = [EmailMessage.read_from_eml_bytes(raw_email) for _ in range(4)]
+    emails[0].uid = 1
+    emails[2].uid = emails[3].uid = 7
+    for email, marker in zip(emails, b"abcd"):
+        email.raw += bytes([marker])
+    iterator = EmailIterator(emails[:2]).chain(EmailIterator(emails[2:]))
+    saved = iterator.save_all_to_directory(str(tmp_path / "first"))
+    names = [os.path.basename(path) for path in saved]
+    assert names == ["1.eml", "1_1.eml", "7.eml", "7_1.eml"]
+    markers = [(tmp_path / "first" / name).read_bytes()[-1:] for name in names]
+    assert markers == [b"a", b"b", b"c", b"d"]
+
+    (tmp_path / "second").mkdir()
+    (tmp_path / "second" / "7.eml").write_bytes(b"old")
+    saved = iterator.save_all_to_directory(str(tmp_path / "second"))
+    assert len(set(saved)) == 4
+    assert (tmp_path / "second" / "7.eml").read_bytes() == b"old"
+    assert len(os.listdir(tmp_path / "second")) == 5
+
+
+def test_email_iterator_save_all_to_directory_with_errors(
+    tmp_path, raw_email, caplog
+):
+    caplog.set_level("ERROR", logger="sage_imap.models.email")
+    emails = [EmailMessage.read_from_eml_bytes(raw_email) for _ in range(3)]
+    emails.append(EmailMessage(message_id="<no-raw@example.com>"))
+    emails[1].uid = int("1" * 300)  # file name too long
+    saved = EmailIterator(emails).save_all_to_directory(str(tmp_path), max_workers=2)
+    assert [os.path.basename(path) for path in saved] == ["0.eml", "2.eml"]
+    assert not (tmp_path / "3.eml").exists()
+    errors = sorted(r.getMessage() for r in caplog.records if r.levelname == "ERROR")
+    assert len(errors) == 2
+    assert "111.eml" in errors[0]
+    assert "3.eml" in errors[1] and "no raw content" in errors[1]
+
+
+def test_to_dict(raw_email):
+    email_message = EmailMessage.read_from_eml_bytes(raw_email)
+    email_message.flags = [Flag.SEEN]
+    data = email_message.to_dict()
+    assert data["message_id"] == "<abc123@example.com>"
+    assert data["subject"] == "Test Subject"
+    assert data["from_address"] == "sender@example.com"
+    assert data["cc_address"] == ["cc@example.com"]
+    assert data["date"] == "2023-07-13T12:00:00+00:00"
+    assert data["plain_body"] == "This is the body of the email"
+    assert data["attachments"] == []
+    assert data["flags"] == ["\\Seen"]
+    assert data["headers"]["Subject"] == "Test Subject"
+
+    assert list(EmailIterator([email_message]).to_dicts()) == [data]
+
+
+def test_get_body_preview():
+    email_message = EmailMessage(message_id="", plain_body="short body")
+    assert email_message.get_body_preview() == "short body"
+
+    email_message.plain_body = "x" * 150
+    assert email_message.get_body_preview(max_length=100) == "x" * 100 + "..."
+
+
+def test_get_body_preview_html_fallback():
+    email_message = EmailMessage(
+        message_id="", html_body="<p>Hello&nbsp;<b>World</b></p>\n<p>again</p>"
+    )
+    assert email_message.get_body_preview() == "Hello World again"
+    assert email_message.get_body_preview(max_length=5) == "Hello..."
+
+    email_message.html_body = "<div>changed</div>"
+    assert email_message.get_body_preview() == "changed"
+
+
+def test_email_iterator_contains_and_find_by_message_id():
+    emails = [
+        EmailMessage(message_id="<a@example.com>", size=1),
+        EmailMessage(message_id="<b@example.com>", size=2),
+        EmailMessage(message_id="", size=3),
+    ]
+    iterator = EmailIterator(emails)
+    assert emails[1] in iterator
+    assert emails[2] in iterator
+    assert EmailMessage(message_id="<b@example.com>", size=99) not in iterator
+    assert iterator.find_by_message_id("<b@example.com>") is emails[1]
+    assert iterator.find_by_message_id("<missing@example.com>") is None
+
+    view = iterator.filter_by_size_range(min_size=2)
+    assert emails[0] not in view
+    assert emails[1] in view
+    assert view.find_by_message_id("<a@example.com>") is None
+    assert view.find_by_message_id("<b@example.com>") is emails[1]
+
+
+def test_email_iterator_filter_by_body_content():
+    emails = [
+        EmailMessage(message_id="", plain_body="Quarterly REPORT attached"),
+        EmailMessage(message_id="", html_body="<p>The report is late</p>"),
+        EmailMessage(message_id="", plain_body="Lunch?"),
+    ]
+    iterator = EmailIterator(emails)
+    assert list(iterator.filter_by_body_content("Report")) == emails[:2]
+    assert list(iterator.filter_by_body_content("report", plain_only=True)) == [
+        emails[0]
+    ]
+    assert list(iterator.filter_by_body_content("report", html_only=True)) == [
+        emails[1]
+    ]
+
+    emails[2].plain_body = "Report for lunch"
+    assert len(iterator.filter_by_body_content("report")) == 3
+
+
+def test_email_iterator_filter_by_body_content_case_sensitive():
+    emails = [
+        EmailMessage(message_id="", plain_body="First message"),
+        EmailMessage(message_id="", html_body="<p>first draft</p>"),
+    ]
+    iterator = EmailIterator(emails)
+    assert len(iterator.filter_by_body_content("first", case_sensitive=False)) == 2
+    assert list(iterator.filter_by_body_content("first", case_sensitive=True)) == [
+        emails[1]
+    ]
+
+
+def test_email_iterator_sort_by_size_subject_sender():
+    emails = [
+        EmailMessage(message_id="", subject="b", from_address="z@x.com", size=20),
+        EmailMessage(message_id="", subject="", from_address=None, size=30),
+        EmailMessage(message_id="", subject="a", from_address="m@x.com", size=10),
+    ]
+    iterator = EmailIterator(emails)
+    assert [e.size for e in iterator.sort_by_size()] == [10, 20, 30]
+    assert [e.size for e in iterator.sort_by_size(reverse=True)] == [30, 20, 10]
+    assert [e.subject for e in iterator.sort_by_subject()] == ["", "a", "b"]
+    assert [e.from_address for e in iterator.sort_by_sender(reverse=True)] == [
+        "z@x.com",
+        "m@x.com",
+        None,
+    ]
+
+    view = iterator.filter_by_size_range(min_size=15)
+    assert [e.size for e in view.sort_by_subject()] == [30, 20]
+
+
+def test_attachment_uses_slots():
+    attachment = Attachment(filename="a.txt", content_type="text/plain", payload=b"")
+    assert not hasattr(attachment, "__dict__")
+    with pytest.raises(AttributeError):
+        attachment.unknown = 1
+
+
+def test_email_iterator_filter_by_content_type_family():
+    emails = [
+        email_with_attachments("image/png"),
+        email_with_attachments("application/pdf"),
+        email_with_attachments("text/csv"),
+        EmailMessage(message_id=""),
+        email_with_attachments("image/heic"),
+    ]
+    iterator = EmailIterator(emails)
+    images = [emails[0], emails[4]]
+    assert list(iterator.filter_by_content_type("image")) == images
+    assert list(iterator.filter_by_content_type("IMAGE")) == images
+    assert list(iterator.filter_by_content_type("image/")) == images
+    assert list(iterator.filter_by_content_type("document")) == [emails[1]]
+    assert list(iterator.filter_by_content_type("spreadsheet")) == [emails[2]]
+    assert list(iterator.filter_by_content_type("text/")) == [emails[2]]
+
+
+def test_attachment_size():
+    attachment = Attachment(filename="a.txt", content_type="text/plain", payload=b"12")
+    assert attachment.size == 2
+    assert Attachment(filename="b", content_type="text/plain", payload=None).size == 0
+
+    declared = Attachment(
+        filename="c.bin", content_type="application/octet-stream", payload=b"", size=7
+    )
+    email_message = EmailMessage(message_id="", attachments=[attachment, declared])
+    assert email_message.total_attachment_size == 9
+
+
+def test_email_iterator_find_all_and_count_by_column():
+    emails = [
+        EmailMessage(message_id="", size=100, date="2023-07-01T00:00:00+00:00"),
+        EmailMessage(message_id="", size=150, date="2023-07-20T00:00:00+00:00"),
+        EmailMessage(message_id="", size=200),
+    ]
+    iterator = EmailIterator(emails)
+    assert iterator.find_all(lambda email: email.size > 120) == emails[1:]
+    assert iterator.find_all_by_column("size", operator.gt, 120) == emails[1:]
+    assert iterator.count_by_column("size", operator.le, 150) == 2
+
+    cutoff = datetime(2023, 7, 10, tzinfo=timezone.utc)
+    assert iterator.find_all_by_column("date", operator.ge, cutoff) == [emails[1]]
+    assert iterator.count_by_column("date", operator.lt, cutoff) == 1
+
+    view = iterator.filter_by_size_range(min_size=150)
+    assert view.find_all_by_column("size", operator.lt, 200) == [emails[1]]
+
+    with pytest.raises(ValueError):
+        iterator.find_all_by_column("subject", operator.eq, "x")
+
+
+def test_email_iterator_group_by_date():
+    emails = [
+        EmailMessage(message_id="", size=1, date="2023-07-02T09:00:00+00:00"),
+        EmailMessage(message_id="", size=2, date="2023-07-01T10:00:00+00:00"),
+        EmailMessage(message_id="", size=3, date="2023-07-02T18:30:00+02:00"),
+        EmailMessage(message_id="", size=4),
+    ]
+    groups = EmailIterator(emails).group_by_date()
+    assert list(groups) == ["2023-07-01", "2023-07-02"]
+    assert [e.size for e in groups["2023-07-02"]] == [1, 3]
+
+    view = EmailIterator(emails).filter_by_size_range(min_size=2)
+    assert {day: len(group) for day, group in view.group_by_date().items()} == {
+        "2023-07-01": 1,
+        "2023-07-02": 1,
+    }
+
+
+def test_email_iterator_filter_by_sender_and_recipient():
+    emails = [
+        EmailMessage(
+            message_id="",
+            from_address="Alice@Example.com",
+            to_address=["Bob@example.com"],
+        ),
+        EmailMessage(
+            message_id="",
+            from_address="carol@example.org",
+            cc_address=["bob@example.com", "dave@example.org"],
+        ),
+        EmailMessage(message_id=""),
+    ]
+    iterator = EmailIterator(emails)
+    assert emails[0].sender_key == "alice@example.com"
+    assert emails[2].sender_key == ""
+    assert list(iterator.filter_by_sender("example.com")) == [emails[0]]
+    assert list(iterator.filter_by_sender("ALICE@example.com", exact_match=True)) == [
+        emails[0]
+    ]
+    assert len(iterator.filter_by_recipient("bob@example.com", exact_match=True)) == 2
+    assert list(iterator.filter_by_recipient("dave")) == [emails[1]]
+    assert len(iterator.filter_by_recipient("dave", exact_match=True)) == 0
+
+    emails[2].to_address = ["dave@example.org"]
+    assert len(iterator.filter_by_recipient("dave")) == 2
+
+
+def test_email_iterator_filter_by_senders():
+    emails = [
+        EmailMessage(message_id="", from_address="alerts@Monitor.io"),
+        EmailMessage(message_id="", from_address="boss@example.com"),
+        EmailMessage(message_id="", from_address="a.b+c@example.org"),
+        EmailMessage(message_id=""),
+    ]
+    iterator = EmailIterator(emails)
+    assert list(iterator.filter_by_senders(["monitor.io", "a.b+c"])) == [
+        emails[0],
+        emails[2],
+    ]
+    assert len(iterator.filter_by_senders(["a.b+"])) == 1
+    assert len(iterator.filter_by_senders([])) == 0
+
+
+def test_email_iterator_attachment_count():
+    emails = [
+        email_with_attachments("text/plain", "text/plain", size=1),
+        EmailMessage(message_id="", size=2),
+        email_with_attachments("text/plain", size=3),
+    ]
+    iterator = EmailIterator(emails)
+    assert emails[0].attachment_count == 2
+    assert list(iterator.filter_by_attachment_count(min_count=1)) == [
+        emails[0],
+        emails[2],
+    ]
+    assert list(iterator.filter_by_attachment_count(max_count=1)) == emails[1:]
+    assert [e.size for e in iterator.sort_by_attachment_count()] == [2, 3, 1]
+    assert [e.size for e in iterator.sort_by_attachment_count(reverse=True)] == [
+        1,
+        3,
+        2,
+    ]
+
+
+def test_body_flags():
+    attachment = Attachment(filename="a.txt", content_type="text/plain", payload=b"")
+    plain = EmailMessage(message_id="", plain_body="text")
+    both = EmailMessage(message_id="", plain_body="text", html_body="<p>text</p>")
+    attached = EmailMessage(message_id="", attachments=[attachment])
+
+    assert plain.has_plain_body() and not plain.has_html_body()
+    assert not plain.is_multipart
+    assert both.is_multipart and not both.has_attachments()
+    assert attached.has_attachments() and attached.is_multipart
+
+    plain.html_body = "<p>added</p>"
+    assert plain.has_html_body() and plain.is_multipart
+
+    iterator = EmailIterator([EmailMessage(message_id=""), both, attached])
+    assert list(iterator.filter_by_attachment()) == [attached]
+    assert list(iterator.filter_by_html_body()) == [both]
+    assert list(iterator.filter_multipart()) == [both, attached]
+
+
+def test_email_iterator_page():
+    emails = [EmailMessage(message_id=f"<{i}@example.com>", size=i) for i in range(5)]
+    iterator = EmailIterator(emails)
+    assert [e.size for e in iterator.page(1, 2)] == [0, 1]
+    assert [e.size for e in iterator.page(3, 2)] == [4]
+    assert len(iterator.page(4, 2)) == 0
+    with pytest.raises(ValueError):
+        iterator.page(0, 2)
+
+
+def test_email_iterator_page_after():
+    emails = [EmailMessage(message_id=f"<{i}@example.com>", size=i) for i in range(5)]
+    iterator = EmailIterator(emails)
+
+    items, cursor = iterator.page_after(None, 2)
+    assert [e.size for e in items] == [0, 1]
+    items, cursor = iterator.page_after(cursor, 2)
+    assert [e.size for e in items] == [2, 3]
+    items, cursor = iterator.page_after(cursor, 2)
+    assert [e.size for e in items] == [4]
+    assert cursor is None
+
+    view = iterator.sort_by_size(reverse=True)
+    items, cursor = view.page_after("<3@example.com>", 2)
+    assert [e.size for e in items] == [2, 1]
+    assert cursor == "<1@example.com>"
+
+    with pytest.raises(ValueError):
+        iterator.filter_by_size_range(min_size=3).page_after("<1@example.com>", 2)
+
+
+def test_email_iterator_page_after_duplicate_message_ids():
+    emails = [
+        EmailMessage(message_id=f"<{i % 2}@example.com>", size=i) for i in range(5)
+    ]
+    iterator = EmailIterator(emails).chain(EmailIterator(emails[:2]))
+    pages, cursor = [], None
+    while True:
+        items, cursor = iterator.page_after(cursor, 2)
+        pages.append([e.size for e in items])
+        if cursor is None:
+            break
+    assert pages == [[0, 1], [2, 3], [4, 0], [1]]
+
+    items, cursor = iterator.page_after("<1@example.com> 1", 1)
+    assert [e.size for e in items] == [4]
+    assert cursor == "<0@example.com> 2"
+    with pytest.raises(ValueError, match="Unknown cursor"):
+        iterator.page_after("<1@example.com> 3", 1)
+
+
+def test_email_iterator_page_after_missing_message_id():
+    emails = [EmailMessage(message_id="<a@example.com>"), EmailMessage(message_id="")]
+    emails.append(EmailMessage(message_id="<b@example.com>"))
+    iterator = EmailIterator(emails)
+    items, cursor = iterator.page_after(None, 1)
+    assert cursor == "<a@example.com>"
+    with pytest.raises(ValueError, match="without a Message-ID"):
+        iterator.page_after(cursor, 1)
+    items, cursor = iterator.page_after(cursor, 2)
+    assert items == emails[1:] and cursor is None
+
+
+def test_email_iterator_get_statistics():
+    attachment = Attachment(filename="a.txt", content_type="text/plain", payload=b"")
+    emails = [
+        EmailMessage(
+            message_id="",
+            from_address="a@example.com",
+            size=100,
+            date="2023-07-01T00:00:00+00:00",
+            attachments=[attachment, attachment],
+        ),
+        EmailMessage(
+            message_id="",
+            from_address="a@example.com",
+            size=200,
+            date="2023-07-03T00:00:00+00:00",
+        ),
+        EmailMessage(message_id="", from_address="b@example.com", size=300),
+    ]
+    assert EmailIterator(emails).get_statistics() == {
+        "total_emails": 3,
+        "total_size": 600,
+        "average_size": 200,
+        "total_attachments": 2,
+        "emails_with_attachments": 1,
+        "unique_senders": 2,
+        "date_range": ("2023-07-01T00:00:00+00:00", "2023-07-03T00:00:00+00:00"),
+    }
+
+    view = EmailIterator(emails).filter_by_size_range(min_size=200)
+    statistics = view.get_statistics()
+    assert statistics["total_size"] == 500
+    assert statistics["emails_with_attachments"] == 0
+    assert EmailIterator([]).get_statistics()["average_size"] == 0
+
+
+def test_email_iterator_deduplicate():
+    emails = [
+        EmailMessage(message_id="<a@example.com>", subject="x", size=1),
+        EmailMessage(message_id="<b@example.com>", subject="x", size=2),
+        EmailMessage(message_id="<a@example.com>", subject="y", size=3),
+        EmailMessage(message_id="", subject="y", size=4),
+        EmailMessage(message_id="", subject="z", size=5),
+    ]
+    iterator = EmailIterator(emails)
+    assert [e.size for e in iterator.deduplicate()] == [1, 2, 4, 5]
+    assert [e.size for e in iterator.deduplicate(lambda e: e.subject)] == [1, 3, 5]
+    assert [e.size for e in iterator.sort_by_size(reverse=True).deduplicate()] == [
+        5,
+        4,
+        3,
+        2,
+    ]
+
+
+def test_email_iterator_groups_follow_view_order():
+    emails = [
+        EmailMessage(
+            message_id="", from_address="a@x.com", size=3, date="2023-07-01T08:00:00"
+        ),
+        EmailMessage(
+            message_id="", from_address="b@x.com", size=1, date="2023-07-01T09:00:00"
+        ),
+        EmailMessage(
+            message_id="", from_address="a@x.com", size=2, date="2023-07-01T10:00:00"
+        ),
+    ]
+    view = EmailIterator(emails).sort_by_size()
+    groups = view.group_by_sender()
+    assert list(groups) == ["b@x.com", "a@x.com"]
+    assert [e.size for e in groups["a@x.com"]] == [2, 3]
+    assert [e.size for e in view.group_by_date()["2023-07-01"]] == [1, 2, 3]
+
+
+@pytest.mark.parametrize(
+    "filename,expected",
+    [
+        ("report.pdf", "report.pdf"),
+        ("../../etc/passwd", "passwd"),
+        ('a<b>c:"d"|e?f*.txt', "a_b_c__d__e_f_.txt"),
+        ("..\\evil.exe", ".._evil.exe"),
+        ("..", "attachment"),
+        ("", "attachment"),
+    ],
+)
+def test_attachment_filename_sanitized(filename, expected):
+    attachment = Attachment(filename=filename, content_type="text/plain", payload=b"")
+    assert attachment.filename == expected
+
+
+def test_content_hash(raw_email):
+    first = EmailMessage.read_from_eml_bytes(raw_email)
+    second = EmailMessage.read_from_eml_bytes(raw_email)
+    assert first.content_hash == second.content_hash
+    assert len(first.content_hash) == 128
+
+    second.raw = raw_email + b"\n"
+    assert first.content_hash != second.content_hash
+
+
+def test_email_iterator_take_and_skip():
+    emails = [EmailMessage(message_id="", size=i) for i in range(5)]
+    iterator = EmailIterator(emails)
+    assert [e.size for e in iterator.take(2)] == [0, 1]
+    assert [e.size for e in iterator.skip(3)] == [3, 4]
+    assert len(iterator.take(-1)) == 0
+    assert len(iterator.skip(-1)) == 5
+    assert isinstance(iterator.take(2)._filtered_indices, range)
+
+    view = iterator.sort_by_size(reverse=True).skip(1).take(2)
+    assert [e.size for e in view] == [3, 2]
+    assert view._email_list is emails
+
+
+def test_email_iterator_filter_reevaluates_criteria():
+    emails = [EmailMessage(message_id="", size=i) for i in range(4)]
+    iterator = EmailIterator(emails)
+    threshold = {"size": 2}
+
+    def is_large(email):
+        return email.size >= threshold["size"]
+
+    assert [e.size for e in iterator.filter(is_large)] == [2, 3]
+    threshold["size"] = 1
+    assert [e.size for e in iterator.filter(is_large)] == [1, 2, 3]
+
+    class Unhashable:
+        __hash__ = None
+
+        def __call__(self, email):
+            return email.size % 2 == 0
+
+    assert [e.size for e in iterator.filter(Unhashable())] == [0, 2]
+
+
+def test_email_iterator_total_size_of_slices():
+    emails = [EmailMessage(message_id="", size=2**40 + i) for i in range(6)]
+    iterator = EmailIterator(emails)
+    assert iterator.get_total_size() == 6 * 2**40 + 15
+    assert iterator[1:4].get_total_size() == 3 * 2**40 + 6
+    assert iterator[::2].get_total_size() == 3 * 2**40 + 6
+    assert iterator[::-2].get_total_size() == 3 * 2**40 + 9
+    assert iterator.page(2, 4).get_total_size() == 2 * 2**40 + 9
+
+
+def test_email_iterator_to_dict_list():
+    emails = [
+        EmailMessage(
+            message_id="<a@example.com>",
+            subject="Hello",
+            from_address="a@example.com",
+            size=10,
+            date="2023-07-01T00:00:00+00:00",
+            uid=7,
+        ),
+        EmailMessage(message_id="<b@example.com>", size=20),
+    ]
+    assert EmailIterator(emails).to_dict_list() == [
+        {
+            "message_id": "<a@example.com>",
+            "subject": "Hello",
+            "from_address": "a@example.com",
+            "size": 10,
+            "date": "2023-07-01T00:00:00+00:00",
+            "uid": 7,
+        },
+        {
+            "message_id": "<b@example.com>",
+            "subject": "",
+            "from_address": None,
+            "size": 20,
+            "date": None,
+            "uid": None,
+        },
+    ]
+
+
+def test_email_iterator_chain():
+    first = [EmailMessage(message_id="", size=i) for i in range(3)]
+    second = [EmailMessage(message_id="", size=i) for i in range(10, 13)]
+    chained = EmailIterator(first).chain(
+        EmailIterator(second).filter_by_size_range(min_size=11), EmailIterator([])
+    )
+    assert len(chained) == 5
+    assert [e.size for e in chained] == [0, 1, 2, 11, 12]
+    assert chained[3] is second[1]
+    assert chained._email_list[-1] is second[2]
+    assert [e.size for e in chained[2:4]] == [2, 11]
+    assert chained.get_total_size() == 26
+    assert [e.size for e in chained.deduplicate(lambda e: e.size % 10)] == [0, 1, 2]
+
+
+def test_email_iterator_unique_senders_and_recipients():
+    emails = [
+        EmailMessage(
+            message_id="",
+            from_address="a@example.com",
+            to_address=["b@example.com"],
+            cc_address=["c@example.com"],
+        ),
+        EmailMessage(
+            message_id="",
+            from_address="a@example.com",
+            to_address=["b@example.com"],
+            bcc_address=["d@example.com"],
+        ),
+        EmailMessage(message_id=""),
+    ]
+    iterator = EmailIterator(emails)
+    assert iterator.get_unique_senders() == {"a@example.com"}
+    assert iterator.get_unique_recipients() == {
+        "b@example.com",
+        "c@example.com",
+        "d@example.com",
+    }
+    assert EmailIterator([]).get_unique_recipients() == set()
+
+
+def test_email_iterator_group_by_date_reuses_day_buckets():
+    emails = [
+        EmailMessage(message_id="", size=1, date="2023-07-02T09:00:00+00:00"),
+        EmailMessage(message_id="", size=2, date="2023-07-01T10:00:00+00:00"),
+    ]
+    iterator = EmailIterator(emails)
+    iterator.group_by_date()
+    days = iterator._lookups["_day"]
+    view = iterator.filter_by_size_range(min_size=2)
+    assert list(view.group_by_date()) == ["2023-07-01"]
+    assert view._lookups["_day"] is days
+
+
+def test_email_iterator_contains_by_identity():
+    emails = [EmailMessage(message_id="", size=i) for i in range(3)]
+    iterator = EmailIterator(emails)
+    assert emails[2] in iterator
+    assert EmailMessage(message_id="", size=1) in iterator
+    assert EmailMessage(message_id="", size=9) not in iterator
+
+    view = iterator.filter_by_size_range(min_size=1)
+    assert emails[0] not in view
+    assert emails[1] in view
+    assert id(emails[1]) in iterator._lookups["_identity"]
+
+
+def test_email_iterator_reversed_view():
+    emails = [EmailMessage(message_id="", size=i) for i in range(4)]
+    iterator = EmailIterator(emails)
+    backwards = reversed(iterator)
+    assert [e.size for e in backwards] == [3, 2, 1, 0]
+    assert backwards._email_list is emails
+    assert backwards._filtered_indices == range(3, -1, -1)
+
+    filtered = reversed(iterator.filter_by_size_range(min_size=1))
+    assert filtered[0] is emails[3]
+    assert [e.size for e in filtered] == [3, 2, 1]
+
+
+def test_email_iterator_sort_by_subject_ignores_case():
+    emails = [
+        EmailMessage(message_id="", subject="beta"),
+        EmailMessage(message_id="", subject="Alpha"),
+        EmailMessage(message_id="", subject="Gamma"),
+        EmailMessage(message_id="", subject=None),
+    ]
+    assert [e.subject for e in EmailIterator(emails).sort_by_subject()] == [
+        None,
+        "Alpha",
+        "beta",
+        "Gamma",
+    ]
+
+
+def test_email_iterator_filter_by_major_content_type():
+    emails = [
+        email_with_attachments("image/png", "text/plain"),
+        email_with_attachments("Image/X-Icon"),
+        email_with_attachments("application/pdf"),
+        email_with_attachments("x-custom/thing"),
+        EmailMessage(message_id=""),
+    ]
+    iterator = EmailIterator(emails)
+    assert emails[2].content_type_bits == 1
+    assert emails[3].content_type_bits == 0
+    assert list(iterator.filter_by_content_type("image/")) == emails[:2]
+    assert list(iterator.filter_by_content_type("TEXT/")) == [emails[0]]
+    assert list(iterator.filter_by_content_type("x-custom/")) == [emails[3]]
+    assert list(iterator.filter_by_content_type("image/png")) == [emails[0]]
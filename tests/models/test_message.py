@@ -0,0 +1,215 @@
+import re
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from sage_imap.models.message import MessageSet
+
+_EMPTY_RE = re.compile(r"Message IDs cannot be empty")
+_INVALID_ID_RE = re.compile(r"Invalid message ID")
+_INVALID_RANGE_RE = re.compile(r"Invalid range in message IDs")
+_INVALID_TYPE_RE = re.compile(r"msg_ids should be a string")
+
+
+@pytest.mark.parametrize(
+    "msg_ids,expected",
+    [
+        ("1", "1"),
+        ("1,2,3", "1,2,3"),
+        ("1:10", "1:10"),
+        ("5:5", "5:5"),
+        ("1,3:5,7", "1,3:5,7"),
+        ("1:*", "1:*"),
+        ([1], "1"),
+        ([1, 2, 3], "1:3"),
+        (["1", "2", "3"], "1:3"),
+        ([1, 2, 3, 5, 6, 7, 10], "1:3,5:7,10"),
+        ([10, 7, 1, 6, 3, 2, 5, 2], "1:3,5:7,10"),
+        ([1, 3, 5, 7, 9], "1,3,5,7,9"),
+        ([4, 4], "4"),
+        ("1,2:3,5,7:9,1:*", "1,2:3,5,7:9,1:*"),
+        ("4294967295", "4294967295"),
+        ("0000000001:4294967295", "0000000001:4294967295"),
+        (b"1,3:5", "1,3:5"),
+        (bytearray(b"1:*"), "1:*"),
+    ],
+)
+def test_message_set_valid(msg_ids, expected):
+    assert MessageSet(msg_ids=msg_ids).msg_ids == expected
+
+
+@pytest.mark.parametrize(
+    "msg_ids,exception,match",
+    [
+        ("", ValueError, _EMPTY_RE),
+        ([], ValueError, _EMPTY_RE),
+        ("abc", ValueError, _INVALID_ID_RE),
+        ("1,,2", ValueError, _INVALID_ID_RE),
+        ("-1", ValueError, _INVALID_ID_RE),
+        ("10:5", ValueError, _INVALID_RANGE_RE),
+        ("a:5", ValueError, _INVALID_RANGE_RE),
+        ("2:*", ValueError, _INVALID_RANGE_RE),
+        ("1:2:3", ValueError, _INVALID_RANGE_RE),
+        ("1:", ValueError, _INVALID_RANGE_RE),
+        ("\u0661", ValueError, _INVALID_ID_RE),
+        (["abc"], ValueError, _INVALID_ID_RE),
+        ([1, -2], ValueError, _INVALID_ID_RE),
+        ([True, 2], ValueError, _INVALID_ID_RE),
+        ("4294967296", ValueError, _INVALID_ID_RE),
+        ("99999999999999999999", ValueError, _INVALID_ID_RE),
+        ("1:4294967296", ValueError, _INVALID_RANGE_RE),
+        ([1.5, 2], ValueError, _INVALID_ID_RE),
+        ([" 1", 2], ValueError, _INVALID_ID_RE),
+        (123, TypeError, _INVALID_TYPE_RE),
+        (b"", ValueError, _EMPTY_RE),
+        (b"1,\xff", ValueError, _INVALID_ID_RE),
+    ],
+)
+def test_message_set_invalid(msg_ids, exception, match):
+    with pytest.raises(exception, match=match):
+        MessageSet(msg_ids=msg_ids)
+
+
+@pytest.mark.parametrize(
+    "msg_ids,message",
+    [
+        ("1,10:5,3", "Invalid range in message IDs: 10:5"),
+        ("1,10:5,abc", "Invalid range in message IDs: 10:5"),
+        ("1,abc,10:5", "Invalid message ID: abc"),
+    ],
+)
+def test_message_set_error_names_the_first_component(msg_ids, message):
+    with pytest.raises(ValueError) as excinfo:
+        MessageSet(msg_ids=msg_ids)
+    assert str(excinfo.value) == message
+
+
+@pytest.fixture(scope="module")
+def mixed_message_set():
+    return MessageSet(msg_ids="20,1,2,3,10:15,14:16")
+
+
+@pytest.mark.parametrize(
+    "msg_id,expected",
+    [
+        (0, False),
+        (1, True),
+        (3, True),
+        (4, False),
+        (9, False),
+        (10, True),
+        (16, True),
+        (17, False),
+        (20, True),
+        (21, False),
+        ("1", False),
+        (True, False),
+        (False, False),
+    ],
+)
+def test_message_set_contains(mixed_message_set, msg_id, expected):
+    assert (msg_id in mixed_message_set) is expected
+
+
+@pytest.mark.parametrize(
+    "msg_ids,first,last",
+    [
+        ("7", 7, 7),
+        ("20,1,2,3,10:15,14:16", 1, 20),
+        ("5:9,2", 2, 9),
+        ([9, 4, 6], 4, 9),
+        ("1:*", 1, None),
+    ],
+)
+def test_message_set_first_last_id(msg_ids, first, last):
+    msg_set = MessageSet(msg_ids=msg_ids)
+    assert msg_set.get_first_id() == first
+    assert msg_set.get_last_id() == last
+
+
+@pytest.mark.parametrize(
+    "start,end,expected",
+    [
+        (1, 1, "1"),
+        (1, 3, "1:3"),
+        (10, 250, "10:250"),
+    ],
+)
+def test_message_set_from_range(start, end, expected):
+    msg_set = MessageSet.from_range(start, end)
+    assert msg_set == MessageSet(msg_ids=expected)
+    assert msg_set.msg_ids == expected
+    assert (msg_set.get_first_id(), msg_set.get_last_id()) == (start, end)
+    assert start in msg_set and end in msg_set
+    assert start - 1 not in msg_set and end + 1 not in msg_set
+
+
+@pytest.mark.parametrize(
+    "start,end", [(0, 5), (5, 4), (-3, -1), (1, 2**32), (2**70, 2**71)]
+)
+def test_message_set_from_range_invalid(start, end):
+    with pytest.raises(ValueError, match=_INVALID_RANGE_RE):
+        MessageSet.from_range(start, end)
+
+
+def test_message_set_of_returns_shared_instance():
+    assert MessageSet.of("1:5") is MessageSet.of("1:5")
+    assert MessageSet.of("1:5") == MessageSet(msg_ids="1:5")
+    assert MessageSet.of("1:*") is MessageSet.ALL
+    assert MessageSet.ALL.msg_ids == "1:*"
+    with pytest.raises(ValueError, match=_INVALID_RANGE_RE):
+        MessageSet.of("5:1")
+
+
+@pytest.mark.parametrize("shared", [MessageSet.of("1,2"), MessageSet.ALL])
+def test_message_set_shared_instances_are_frozen(shared):
+    msg_ids = shared.msg_ids
+    with pytest.raises(FrozenInstanceError):
+        shared.msg_ids = "5"
+    assert shared.msg_ids == msg_ids
+    assert MessageSet.of(msg_ids).msg_ids == msg_ids
+    assert 1 in shared
+    own = MessageSet(msg_ids=msg_ids)
+    own.msg_ids = "5"
+    assert own.msg_ids == "5"
+
+
+def test_message_set_contains_open_range():
+    msg_set = MessageSet(msg_ids="1:*")
+    assert 1 in msg_set
+    assert 2**32 - 1 in msg_set
+    assert 2**32 not in msg_set
+    assert 2**70 not in msg_set
+    assert True not in msg_set
+    assert 0 not in msg_set
+
+
+def test_message_set_contains_after_reassignment():
+    msg_set = MessageSet(msg_ids="1:3")
+    assert 2 in msg_set
+    msg_set.msg_ids = "5"
+    assert 2 not in msg_set
+    assert 5 in msg_set
+
+
+def test_message_set_intervals_cached():
+    msg_set = MessageSet(msg_ids="1:3,7")
+    intervals = msg_set._intervals
+    assert msg_set._intervals is intervals
+
+
+def test_message_set_has_no_instance_dict():
+    msg_set = MessageSet(msg_ids="1")
+    assert not hasattr(msg_set, "__dict__")
+    with pytest.raises(AttributeError):
+        msg_set.msg_id = "2"
+
+
+def test_message_set_validates_on_assignment():
+    msg_set = MessageSet(msg_ids="1")
+    msg_set.msg_ids = [3, 4, 5]
+    assert msg_set.msg_ids == "3:5"
+    with pytest.raises(TypeError, match=_INVALID_TYPE_RE):
+        msg_set.msg_ids = 123
+    with pytest.raises(ValueError, match=_INVALID_RANGE_RE):
+        msg_set.msg_ids = "5:1"
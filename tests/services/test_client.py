@@ -56,6 +56,8 @@ def test_imap_client_enter_authentication_failure(imap_client):
         with pytest.raises(IMAPAuthenticationError):
             with imap_client:
                 pass
+        assert imap_client.connection is None
+        mock_connection.shutdown.assert_called_once()
 
 
 def test_imap_client_exit_success(imap_client):
@@ -97,3 +99,92 @@ def test_imap_client_exit_failure(imap_client):
         with pytest.raises(IMAPUnexpectedError):
             with imap_client:
                 pass
+
+
+def test_imap_client_persistent_reuses_connection():
+    with mock.patch("imaplib.IMAP4_SSL") as mock_imap, mock.patch(
+        "socket.gethostbyname", return_value="127.0.0.1"
+    ):
+        mock_connection = mock.Mock(spec=IMAP4_SSL)
+        mock_imap.return_value = mock_connection
+
+        with IMAPClient.persistent(
+            "imap.example.com", "username", "password"
+        ) as imap_client:
+            with imap_client as first:
+                pass
+            with imap_client as second:
+                pass
+            assert first is second
+            mock_connection.logout.assert_not_called()
+
+        mock_imap.assert_called_once_with("imap.example.com")
+        mock_connection.login.assert_called_once_with("username", "password")
+        mock_connection.logout.assert_called_once()
+        assert imap_client.connection is None
+
+
+def test_imap_client_persistent_retries_after_login_failure():
+    with mock.patch("imaplib.IMAP4_SSL") as mock_imap, mock.patch(
+        "socket.gethostbyname", return_value="127.0.0.1"
+    ):
+        failed_connection = mock.Mock(spec=IMAP4_SSL)
+        failed_connection.login.side_effect = IMAP4.error
+        mock_connection = mock.Mock(spec=IMAP4_SSL)
+        mock_imap.side_effect = [failed_connection, mock_connection]
+
+        with IMAPClient.persistent(
+            "imap.example.com", "username", "password"
+        ) as imap_client:
+            with pytest.raises(IMAPAuthenticationError):
+                with imap_client:
+                    pass
+            with imap_client as connection:
+                assert connection is mock_connection
+
+        mock_connection.login.assert_called_once_with("username", "password")
+        failed_connection.noop.assert_not_called()
+
+
+def test_imap_client_persistent_reconnects_dropped_connection():
+    with mock.patch("imaplib.IMAP4_SSL") as mock_imap, mock.patch(
+        "socket.gethostbyname", return_value="127.0.0.1"
+    ):
+        dropped_connection = mock.Mock(spec=IMAP4_SSL)
+        dropped_connection.noop.side_effect = IMAP4.abort("socket error: EOF")
+        mock_connection = mock.Mock(spec=IMAP4_SSL)
+        mock_imap.side_effect = [dropped_connection, mock_connection]
+
+        with IMAPClient.persistent(
+            "imap.example.com", "username", "password"
+        ) as imap_client:
+            with imap_client as first:
+                assert first is dropped_connection
+            with imap_client as second:
+                assert second is mock_connection
+            with imap_client as third:
+                assert third is mock_connection
+
+        assert mock_imap.call_count == 2
+        dropped_connection.shutdown.assert_called_once()
+        mock_connection.noop.assert_called_once()
+        mock_connection.logout.assert_called_once()
+
+
+def test_imap_client_persistent_logout_failure_keeps_block_error():
+    with mock.patch("imaplib.IMAP4_SSL") as mock_imap, mock.patch(
+        "socket.gethostbyname", return_value="127.0.0.1"
+    ):
+        mock_connection = mock.Mock(spec=IMAP4_SSL)
+        mock_connection.logout.side_effect = IMAP4.error("logout failed")
+        mock_imap.return_value = mock_connection
+
+        with pytest.raises(KeyError):
+            with IMAPClient.persistent(
+                "imap.example.com", "username", "password"
+            ) as imap_client:
+                with imap_client:
+                    raise KeyError("body error")
+
+        mock_connection.logout.assert_called_once()
+        assert imap_client.connection is None
@@ -6,7 +6,7 @@ from sage_imap.exceptions import (
     IMAPFolderOperationError,
     IMAPUnexpectedError,
 )
-from sage_imap.helpers.mailbox import DefaultMailboxes
+from sage_imap.helpers.enums import DefaultMailboxes
 from sage_imap.services.client import IMAPClient
 from sage_imap.services.folder import IMAPFolderService
 
@@ -92,9 +92,19 @@ def test_delete_folder_exception(folder_service, mock_client):
         folder_service.delete_folder("ExceptionFolder")
     mock_client.delete.assert_called_once_with("ExceptionFolder")
 
-def test_delete_default_folder(folder_service):
+@pytest.mark.parametrize(
+    "folder_name",
+    [mailbox.value for mailbox in DefaultMailboxes] + ["inbox", "InBox"],
+)
+def test_delete_default_folder(folder_service, mock_client, folder_name):
     with pytest.raises(IMAPUnexpectedError):
-        folder_service.delete_folder(DefaultMailboxes.INBOX.value)
+        folder_service.delete_folder(folder_name)
+    mock_client.delete.assert_not_called()
+
+def test_delete_folder_named_like_default_folder(folder_service, mock_client):
+    mock_client.delete.return_value = ("OK", [b""])
+    folder_service.delete_folder("Sent Archive")
+    mock_client.delete.assert_called_once_with("Sent Archive")
 
 def test_list_folders_success(folder_service, mock_client):
     mock_client.list.return_value = ("OK", [b'(\\HasNoChildren) "/" INBOX', b'(\\HasNoChildren) "/" Sent'])
@@ -102,6 +112,21 @@ def test_list_folders_success(folder_service, mock_client):
     assert folders == ["INBOX", "Sent"]
     mock_client.list.assert_called_once()
 
+@pytest.mark.parametrize(
+    "line,expected",
+    [
+        (b'(\\HasNoChildren) "/" "Sent Items"', "Sent Items"),
+        (b'(\\HasNoChildren) "." Archive.2024', "Archive.2024"),
+        (b'(\\Noselect) NIL "Archive"', "Archive"),
+        (b"(\\Noselect) NIL Archive", "Archive"),
+        (b'() "/" INBOX', "INBOX"),
+        (b'(\\HasChildren \\Marked) "/" "Projects/Q1 Plans"', "Projects/Q1 Plans"),
+    ],
+)
+def test_list_folders_names(folder_service, mock_client, line, expected):
+    mock_client.list.return_value = ("OK", [line])
+    assert folder_service.list_folders() == [expected]
+
 def test_list_folders_operation_error(folder_service, mock_client):
     mock_client.list.return_value = ("NO", [b"Some error"])
     with pytest.raises(IMAPFolderOperationError):
@@ -0,0 +1,31 @@
+from sage_imap.decorators import cached_property
+from sage_imap.models.email import EmailMessage
+
+
+class Sample:
+    def __init__(self):
+        self.calls = 0
+
+    @cached_property
+    def value(self):
+        """The computed value."""
+        self.calls += 1
+        return object()
+
+
+def test_cached_property_computes_once():
+    sample = Sample()
+    value = sample.value
+    assert sample.value is value
+    assert sample.calls == 1
+    del sample.__dict__["value"]
+    assert sample.value is not value
+    assert sample.calls == 2
+
+
+def test_cached_property_keeps_wrapped_metadata():
+    assert Sample.value.__doc__ == "The computed value."
+    assert Sample.value.__module__ == __name__
+    assert Sample.value.name == "value"
+    assert EmailMessage.subject_lower.__doc__ is None
+    assert EmailMessage.subject_lower.__module__ == "sage_imap.models.email"
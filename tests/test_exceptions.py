@@ -44,158 +44,115 @@ def test_imap_client_error_custom():
     assert str(error) == "Custom error (Code: custom_error, Status Code: 400)"
 
 
-def test_imap_configuration_error():
-    error = IMAPConfigurationError()
+def test_imap_client_error_defaults_not_stored_on_instance():
+    error = IMAPConfigurationError(code="custom_error")
+    assert error.__dict__ == {"code": "custom_error"}
     assert error.detail == "Invalid IMAP configuration."
-    assert error.code == "configuration_error"
-    assert error.status_code == 400
-
-
-def test_imap_connection_error():
-    error = IMAPConnectionError()
-    assert error.detail == "Failed to connect to IMAP server."
-    assert error.code == "connection_error"
-    assert error.status_code == 502
-
-
-def test_imap_authentication_error():
-    error = IMAPAuthenticationError()
-    assert error.detail == "Failed to authenticate with IMAP server."
-    assert error.code == "authentication_error"
-    assert error.status_code == 401
-
-
-def test_imap_folder_error():
-    error = IMAPFolderError()
-    assert error.detail == "A folder-related error occurred."
-    assert error.code == "folder_error"
-    assert error.status_code == 500
-
-
-def test_imap_folder_operation_error():
-    error = IMAPFolderOperationError()
-    assert error.detail == "Failed to perform folder operation."
-    assert error.code == "folder_operation_error"
-    assert error.status_code == 500
-
-
-def test_imap_folder_not_found_error():
-    error = IMAPFolderNotFoundError()
-    assert error.detail == "Folder not found."
-    assert error.code == "folder_not_found_error"
-    assert error.status_code == 404
-
-
-def test_imap_folder_exists_error():
-    error = IMAPFolderExistsError()
-    assert error.detail == "Folder already exists."
-    assert error.code == "folder_exists_error"
-    assert error.status_code == 409
-
-
-def test_imap_default_folder_error():
-    error = IMAPDefaultFolderError()
-    assert error.detail == "Operation not allowed on default folder."
-    assert error.code == "default_folder_error"
-    assert error.status_code == 403
-
-
-def test_imap_unexpected_error():
-    error = IMAPUnexpectedError()
-    assert error.detail == "An unexpected error occurred with the IMAP server."
-    assert error.code == "unexpected_error"
-    assert error.status_code == 500
-
-
-def test_imap_flag_error():
-    error = IMAPFlagError()
-    assert error.detail == "A flag-related error occurred."
-    assert error.code == "flag_error"
-    assert error.status_code == 500
-
-
-def test_imap_flag_operation_error():
-    error = IMAPFlagOperationError()
-    assert error.detail == "Failed to perform flag operation."
-    assert error.code == "flag_operation_error"
-    assert error.status_code == 500
-
-
-def test_imap_mailbox_error():
-    error = IMAPMailboxError()
-    assert error.detail == "A mailbox-related error occurred."
-    assert error.code == "mailbox_error"
-    assert error.status_code == 500
-
-
-def test_imap_mailbox_selection_error():
-    error = IMAPMailboxSelectionError()
-    assert error.detail == "Failed to select mailbox."
-    assert error.code == "mailbox_selection_error"
-    assert error.status_code == 500
-
-
-def test_imap_mailbox_closure_error():
-    error = IMAPMailboxClosureError()
-    assert error.detail == "Failed to close mailbox."
-    assert error.code == "mailbox_closure_error"
-    assert error.status_code == 500
-
-
-def test_imap_mailbox_check_error():
-    error = IMAPMailboxCheckError()
-    assert error.detail == "Failed to perform mailbox check."
-    assert error.code == "mailbox_check_error"
-    assert error.status_code == 500
-
-
-def test_imap_mailbox_delete_error():
-    error = IMAPMailboxDeleteError()
-    assert error.detail == "Failed to delete email."
-    assert error.code == "delete_error"
-    assert error.status_code == 500
-
-
-def test_imap_mailbox_permanent_delete_error():
-    error = IMAPMailboxPermanentDeleteError()
-    assert error.detail == "Failed to permanently delete email."
-    assert error.code == "permanent_delete_error"
-    assert error.status_code == 500
-
-
-def test_imap_mailbox_move_error():
-    error = IMAPMailboxMoveError()
-    assert error.detail == "Failed to move email."
-    assert error.code == "move_error"
-    assert error.status_code == 500
-
-
-def test_imap_search_error():
-    error = IMAPSearchError()
-    assert error.detail == "Failed to search emails."
-    assert error.code == "search_error"
-    assert error.status_code == 500
-
-
-def test_imap_mailbox_save_sent_error():
-    error = IMAPMailboxSaveSentError()
-    assert error.detail == "Failed to save sent email."
-    assert error.code == "save_sent_error"
-    assert error.status_code == 500
-
-
-def test_imap_mailbox_status_error():
-    error = IMAPMailboxStatusError()
-    assert error.detail == "Failed to get mailbox status."
-    assert error.code == "status_error"
-    assert error.status_code == 500
-
-
-def test_imap_mailbox_fetch_error():
-    error = IMAPMailboxFetchError()
-    assert error.detail == "Failed to fetch email messages."
-    assert error.code == "fetch_error"
-    assert error.status_code == 500
+    assert IMAPConfigurationError().code == "configuration_error"
+
+
+def test_imap_client_error_subclass_keeps_own_detail_and_code():
+    class CustomError(IMAPClientError):
+        detail = "Custom detail."
+        code = "custom"
+
+    error = CustomError()
+    assert error.detail == "Custom detail."
+    assert error.code == "custom"
+
+
+@pytest.mark.parametrize(
+    "error_class,detail,code,status_code",
+    [
+        (
+            IMAPConfigurationError,
+            "Invalid IMAP configuration.",
+            "configuration_error",
+            400,
+        ),
+        (
+            IMAPConnectionError,
+            "Failed to connect to IMAP server.",
+            "connection_error",
+            502,
+        ),
+        (
+            IMAPAuthenticationError,
+            "Failed to authenticate with IMAP server.",
+            "authentication_error",
+            401,
+        ),
+        (IMAPFolderError, "A folder-related error occurred.", "folder_error", 500),
+        (
+            IMAPFolderOperationError,
+            "Failed to perform folder operation.",
+            "folder_operation_error",
+            500,
+        ),
+        (IMAPFolderNotFoundError, "Folder not found.", "folder_not_found_error", 404),
+        (IMAPFolderExistsError, "Folder already exists.", "folder_exists_error", 409),
+        (
+            IMAPDefaultFolderError,
+            "Operation not allowed on default folder.",
+            "default_folder_error",
+            403,
+        ),
+        (
+            IMAPUnexpectedError,
+            "An unexpected error occurred with the IMAP server.",
+            "unexpected_error",
+            500,
+        ),
+        (IMAPFlagError, "A flag-related error occurred.", "flag_error", 500),
+        (
+            IMAPFlagOperationError,
+            "Failed to perform flag operation.",
+            "flag_operation_error",
+            500,
+        ),
+        (IMAPMailboxError, "A mailbox-related error occurred.", "mailbox_error", 500),
+        (
+            IMAPMailboxSelectionError,
+            "Failed to select mailbox.",
+            "mailbox_selection_error",
+            500,
+        ),
+        (
+            IMAPMailboxClosureError,
+            "Failed to close mailbox.",
+            "mailbox_closure_error",
+            500,
+        ),
+        (
+            IMAPMailboxCheckError,
+            "Failed to perform mailbox check.",
+            "mailbox_check_error",
+            500,
+        ),
+        (IMAPMailboxDeleteError, "Failed to delete email.", "delete_error", 500),
+        (
+            IMAPMailboxPermanentDeleteError,
+            "Failed to permanently delete email.",
+            "permanent_delete_error",
+            500,
+        ),
+        (IMAPMailboxMoveError, "Failed to move email.", "move_error", 500),
+        (IMAPSearchError, "Failed to search emails.", "search_error", 500),
+        (
+            IMAPMailboxSaveSentError,
+            "Failed to save sent email.",
+            "save_sent_error",
+            500,
+        ),
+        (IMAPMailboxStatusError, "Failed to get mailbox status.", "status_error", 500),
+        (IMAPMailboxFetchError, "Failed to fetch email messages.", "fetch_error", 500),
+    ],
+)
+def test_imap_error_defaults(error_class, detail, code, status_code):
+    error = error_class()
+    assert error.detail == detail
+    assert error.code == code
+    assert error.status_code == status_code
 
 
 if __name__ == "__main__":